@@ -1,13 +1,44 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-from PIL import Image
-import base64
-from io import BytesIO
+import pandas as pd
 import os
+import time
+
+from assets import get_base64_image, publish_static_assets
+from charts import (chart_backend, comparison_chart_figure, comparison_chart_png,
+                    sensitivity_heatmap_figure, sensitivity_heatmap_png,
+                    simulation_histogram_figure, simulation_histogram_png)
+from instrumentation import ENABLED as instrumented, record, render_debug_panel, section
+from roi_engine import default_tier, projected_monthly_minutes, tier_for_minutes, tier_labels, tier_margin
+from goal_seek import goal_seek
+from portfolio import evaluate_portfolio
+from proposal_export import EXPORT_FORMATS, export_queue, proposal_scenario, scenarios_from_frame
+from projection import MAX_HORIZON_YEARS
+from scenario_store import decode_scenario, encode_scenario
+from simulation import savings_histogram, simulate_roi
+from views import (breakdown_table_html, faq_tabs, header_html, logo_html, page_css, projection_card_html,
+                   projection_for, roi_for, savings_card_html, section_heading, sensitivity_grid_for, watermark_html)
+
+# Opt-in section timings (CONNEXUS_INSTRUMENT=1); section() is a no-op otherwise
+run_started = time.perf_counter() if instrumented else None
+
+# —— Asset Mode ——
+# "static" serves images from app/static/ so browsers cache them; "inline" embeds
+# them as base64 data URIs (used automatically when static serving is off)
+asset_mode = os.environ.get("CONNEXUS_ASSET_MODE", "static")
+if asset_mode == "static" and not st.get_option("server.enableStaticServing"):
+    asset_mode = "inline"
+with section("asset publishing"):
+    try:
+        static_urls = publish_static_assets() if asset_mode == "static" else {}
+    except OSError:
+        # Read-only app directory or a blocked static/ path: embed the images instead
+        asset_mode = "inline"
+        static_urls = {}
 
 # —— Page Setup ——
-st.set_page_config(page_title="ConnexUS AI vs Human ROI Calculator", layout="wide", page_icon=None)
+favicon_url = static_urls.get("favicon-32x32.png")
+st.set_page_config(page_title="ConnexUS AI vs Human ROI Calculator", layout="wide",
+                   page_icon=f"/{favicon_url}" if favicon_url else None)
 
 # —— Load Logo & Watermark ——
 def load_base64_image(image_path):
@@ -16,10 +47,8 @@ def load_base64_image(image_path):
             st.warning(f"Image file not found: {image_path}")
             return None
         
-        img = Image.open(image_path)
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        return base64.b64encode(buf.getvalue()).decode()
+        # Encoded once per process and reused until the file changes
+        return get_base64_image(image_path)
     except Exception as e:
         st.warning(f"Error loading image {image_path}: {str(e)}")
         return None
@@ -29,469 +58,422 @@ logo_path = "connexus_logo.png"
 watermark_path = "connexus_logo_watermark.png"
 
 # —— CSS Styling ——
-st.markdown("""
-<style>
-    /* Main container styling */
-    .block-container {
-        padding-top: 1rem !important;
-    }
-    
-    /* Logo styling */
-    .sidebar-logo {
-        display: flex;
-        justify-content: center;
-        margin-bottom: 20px;
-    }
-    .sidebar-logo img {
-        max-height: 60px;
-        width: auto;
-        object-fit: contain;
-    }
-    
-    /* Watermark */
-    .watermark {
-        position: fixed;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        width: 800px;
-        height: 800px;
-        opacity: 0.08;
-        background-repeat: no-repeat;
-        background-position: center;
-        background-size: contain;
-        pointer-events: none;
-        z-index: -1;
-    }
-    
-    /* Section headings */
-    .section-heading {
-        color: #00FFAA;
-        font-size: 24px;
-        font-weight: bold;
-        margin-bottom: 20px;
-        padding-left: 10px;
-        border-left: 4px solid #FF6700;
-    }
-    
-    /* Chart container styling for better fit */
-    .chart-container {
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        width: 100%;
-        max-height: 50vh;
-        margin: 20px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Watermark CSS injection
-watermark_b64 = load_base64_image(watermark_path)
-if watermark_b64:
-    st.markdown(f"""
-        <style>
-        .watermark {{
-          background-image: url("data:image/png;base64,{watermark_b64}");
-        }}
-        </style>
-        <div class="watermark"></div>
-    """, unsafe_allow_html=True)
-
-# —— Header Title ——
-st.markdown("""
-    <div style='text-align:center; font-size:40px; font-weight:bold; color:#00FFAA; margin-bottom:20px;'>
-        🤖 ConnexUS AI vs Human ROI Calculator
-    </div>
-""", unsafe_allow_html=True)
-
-# —— Logo in sidebar ——
-logo_b64 = load_base64_image(logo_path)
-if logo_b64:
-    st.sidebar.markdown(f"""
-        <div class="sidebar-logo">
-            <img src='data:image/png;base64,{logo_b64}'>
-        </div>
-    """, unsafe_allow_html=True)
+st.markdown(page_css, unsafe_allow_html=True)
+
+def image_src(image_path):
+    # URL for an <img>/CSS reference: the published static file, or a data URI fallback
+    if image_path in static_urls:
+        return static_urls[image_path]
+    b64 = load_base64_image(image_path)
+    return f"data:image/png;base64,{b64}" if b64 else None
+
+with section("asset loading"):
+    # Watermark CSS injection
+    watermark_src = image_src(watermark_path)
+    if watermark_src:
+        st.markdown(watermark_html(watermark_src), unsafe_allow_html=True)
+
+    # —— Header Title ——
+    st.markdown(header_html, unsafe_allow_html=True)
+
+    # —— Logo in sidebar ——
+    logo_src = image_src(logo_path)
+    if logo_src:
+        st.sidebar.markdown(logo_html(logo_src), unsafe_allow_html=True)
+
+# —— Scenario From URL ——
+# Shared links carry the sidebar inputs as query params. They seed the widget
+# defaults once per session; after that the widgets own the values.
+if "url_scenario" not in st.session_state:
+    st.session_state.url_scenario = decode_scenario(st.query_params.to_dict())
+url_scenario = st.session_state.url_scenario
 
 # —— Sidebar Inputs ——
 st.sidebar.header("🔧 Input Parameters")
-human_hourly = st.sidebar.number_input("Human Hourly Rate ($)", value=19.5, min_value=0.0, step=0.1)
-hours_day = st.sidebar.number_input("Working Hours per Day", value=8.0, min_value=0.0, step=0.5)
-efficiency = st.sidebar.slider("Human Agent Utilization (%)", min_value=0, max_value=100, value=65, step=5) / 100
+human_hourly = st.sidebar.number_input("Human Hourly Rate ($)", value=url_scenario["human_hourly"], min_value=0.0, step=0.1)
+hours_day = st.sidebar.number_input("Working Hours per Day", value=url_scenario["hours_day"], min_value=0.0, step=0.5)
+efficiency = st.sidebar.slider("Human Agent Utilization (%)", min_value=0, max_value=100, value=url_scenario["efficiency"], step=5) / 100
 
 # Add AI Automation slider
-automation_pct = st.sidebar.slider("AI Automation Level (%)", min_value=0, max_value=100, value=50, step=5) / 100
+automation_pct = st.sidebar.slider("AI Automation Level (%)", min_value=0, max_value=100, value=url_scenario["automation_pct"], step=5) / 100
 
-# Replace the AI cost per minute slider with a dropdown
-ai_tier_data = {
-    "Tier 1 (1,000-4,999 min) - $0.25": {"client_rate": 0.25, "ai_telephony": 0.20, "mgmt_fee": 0.05},
-    "Tier 2 (5,000-9,999 min) - $0.22": {"client_rate": 0.22, "ai_telephony": 0.18, "mgmt_fee": 0.04},
-    "Tier 3 (10,000-24,999 min) - $0.18": {"client_rate": 0.18, "ai_telephony": 0.15, "mgmt_fee": 0.03},
-    "Tier 4 (25,000-49,999 min) - $0.16": {"client_rate": 0.16, "ai_telephony": 0.14, "mgmt_fee": 0.02},
-    "Tier 5 (≥50,000 min) - $0.14": {"client_rate": 0.14, "ai_telephony": 0.12, "mgmt_fee": 0.02}
-}
+# Agents scale the projected monthly AI volume that volume-based tiers follow
+num_agents = st.sidebar.number_input("Number of Agents", value=url_scenario["agents"], min_value=1, step=1)
+monthly_ai_minutes = projected_monthly_minutes(hours_day, automation_pct, num_agents)
 
-selected_tier = st.sidebar.selectbox("AI Cost per Minute", list(ai_tier_data.keys()), index=2)  # Default to Tier 3
-ai_cost_per_minute = ai_tier_data[selected_tier]["client_rate"]
+# Replace the AI cost per minute slider with a dropdown
+# Tier can follow the projected AI volume instead of being picked by hand
+auto_tier = st.sidebar.checkbox("Select tier from projected volume", value=url_scenario["tier"] == "auto")
+if auto_tier:
+    selected_tier = tier_for_minutes(monthly_ai_minutes)
+    st.sidebar.selectbox("AI Cost per Minute", tier_labels, index=tier_labels.index(selected_tier), disabled=True)
+else:
+    url_tier = default_tier if url_scenario["tier"] == "auto" else url_scenario["tier"]  # Default to Tier 3
+    selected_tier = st.sidebar.selectbox("AI Cost per Minute", tier_labels, index=tier_labels.index(url_tier))
+st.sidebar.caption(f"Projected AI volume: {monthly_ai_minutes:,.0f} min/month")
+
+# Keep the URL in step with the inputs so it can be copied and shared as is
+scenario_query = encode_scenario({
+    "human_hourly": human_hourly,
+    "hours_day": hours_day,
+    "efficiency": round(efficiency * 100),
+    "automation_pct": round(automation_pct * 100),
+    "agents": num_agents,
+    "tier": "auto" if auto_tier else selected_tier,
+})
+if st.query_params.to_dict() != scenario_query:
+    st.query_params.from_dict(scenario_query)
+
+with st.sidebar.expander("Tier margin breakdown"):
+    margin = tier_margin(selected_tier, monthly_ai_minutes)
+    st.write(f"AI telephony: ${margin['ai_telephony']:.2f}/min (${margin['monthly_telephony_cost']:,.2f}/month)")
+    st.write(f"Management fee: ${margin['mgmt_fee']:.2f}/min (${margin['monthly_mgmt_fee']:,.2f}/month)")
+    st.write(f"Client rate: ${margin['client_rate']:.2f}/min ({margin['margin_pct']:.1f}% margin)")
 
 # —— Core Calculations ——
-ai_hourly = ai_cost_per_minute * 60
-cost_day = human_hourly * hours_day
-worked_hours = hours_day * efficiency
-
-# Calculate blended cost based on automation level
-human_portion = 1 - automation_pct  # Percentage still handled by humans
-ai_portion = automation_pct  # Percentage handled by AI
-
-# Blended hourly cost calculation
-cost_per_eff_hour = cost_day / worked_hours if worked_hours > 0 else 0
-blended_hourly_cost = (human_portion * cost_per_eff_hour) + (ai_portion * ai_hourly)
-
-# Calculate savings comparing 100% human vs blended approach
-savings_per_hour = cost_per_eff_hour - blended_hourly_cost
-savings_pct = (savings_per_hour / cost_per_eff_hour * 100) if cost_per_eff_hour > 0 else 0
+with section("calculations"):
+    roi = roi_for(human_hourly, hours_day, efficiency, automation_pct, selected_tier)
+    ai_cost_per_minute = roi["ai_cost_per_minute"]
+    ai_hourly = roi["ai_hourly"]
+    cost_day = roi["cost_day"]
+    worked_hours = roi["worked_hours"]
+    human_portion = roi["human_portion"]  # Percentage still handled by humans
+    ai_portion = roi["ai_portion"]  # Percentage handled by AI
+    cost_per_eff_hour = roi["cost_per_eff_hour"]
+    blended_hourly_cost = roi["blended_hourly_cost"]
+    savings_per_hour = roi["savings_per_hour"]
+    savings_pct = roi["savings_pct"]
 
 # —— Breakdown Table ——
-st.markdown("<div class='section-heading'>📊 Breakdown Table</div>", unsafe_allow_html=True)
-
-# Create a cleaner, prettier table with better styling
-table_html = f"""
-<div style="display: flex; justify-content: center; margin-bottom: 30px;">
-  <table style="background-color: rgba(0, 0, 0, 0.2); border-collapse: collapse; width: 80%; border: 2px solid #333; border-radius: 4px; overflow: hidden; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
-    <tr style="border-bottom: 2px solid #333; background-color: rgba(0, 0, 0, 0.3);">
-      <th style="padding: 14px; text-align: left; color: #00FFAA; border-right: 1px solid #444; font-size: 18px;"></th>
-      <th style="padding: 14px; text-align: center; color: #00FFAA; border-right: 1px solid #444; font-size: 18px;">Human</th>
-      <th style="padding: 14px; text-align: center; color: #00FFAA; font-size: 18px;">AI</th>
-    </tr>
-    <tr style="border-bottom: 1px solid #333; transition: background-color 0.2s;">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Cost per minute</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${human_hourly/60:.2f}</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_cost_per_minute:.2f}</td>
-    </tr>
-    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Hourly Rate</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${human_hourly:.2f}</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_hourly:.2f}</td>
-    </tr>
-    <tr style="border-bottom: 1px solid #333;">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Working hours per day</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{hours_day}</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">{hours_day}</td>
-    </tr>
-    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Utilization</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{efficiency*100:.0f}%</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">100%</td>
-    </tr>
-    <tr style="border-bottom: 1px solid #333;">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Cost per day</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${cost_day:.2f}</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_hourly * hours_day:.2f}</td>
-    </tr>
-    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
-      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Effective hours worked</td>
-      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{worked_hours:.2f}</td>
-      <td style="padding: 12px; text-align: center; color: #EEE;">{hours_day}</td>
-    </tr>
-    <tr style="background-color: rgba(0,0,0,0.2);">
-      <td style="padding: 14px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: bold;">Cost per effective hour</td>
-      <td style="padding: 14px; text-align: center; color: #EEE; border-right: 1px solid #444; font-weight: bold; font-size: 18px;">${cost_per_eff_hour:.2f}</td>
-      <td style="padding: 14px; text-align: center; color: #EEE; font-weight: bold; font-size: 18px;">${ai_hourly:.2f}</td>
-    </tr>
-  </table>
-</div>
-"""
-st.markdown(table_html, unsafe_allow_html=True)
+with section("breakdown table"):
+    st.markdown(section_heading("📊 Breakdown Table"), unsafe_allow_html=True)
+    table_html = breakdown_table_html(human_hourly, hours_day, efficiency, ai_cost_per_minute, ai_hourly,
+                                      cost_day, worked_hours, cost_per_eff_hour)
+    st.markdown(table_html, unsafe_allow_html=True)
 
 # —— Visual Comparison - Properly Sized for 15.6" Screen ——
-st.markdown("<div class='section-heading'>🌐 Visual Comparison</div>", unsafe_allow_html=True)
-
-# Create a container that fits well on a 15.6" screen
-col1, col2, col3 = st.columns([1, 2, 1])  # Center the chart with padding on sides
-
-with col2:
-    # Create appropriately sized chart for 15.6" screen (about 75% of screen height)
-    fig, ax = plt.subplots(figsize=(8, 6))  # Adjusted size for better fit
-    # Set transparent background
-    fig.patch.set_alpha(0)
-    ax.patch.set_alpha(0)
-
-    labels = ['100% Human', f'{human_portion*100:.0f}% Human +\n{ai_portion*100:.0f}% AI']
-    costs = [cost_per_eff_hour, blended_hourly_cost]
-    colors = ['#FF6B6B', '#4D96FF']
-
-    bars = ax.bar(labels, costs, color=colors, width=0.6, edgecolor='#FF6700', linewidth=2)
-
-    # Add cost labels in the middle of the bars
-    for i, bar in enumerate(bars):
-        height = bar.get_height()
-        # Centered cost values
-        ax.text(bar.get_x() + bar.get_width()/2, height/2,
-                f"${height:.2f}",
-                ha='center', va='center',
-                fontsize=16, fontweight='bold', color='white')
-
-    # Position savings box between the bars
-    if len(bars) >= 2:
-        savings_x = (bars[0].get_x() + bars[0].get_width() + bars[1].get_x()) / 2
-        savings_y = max(costs) * 0.8
-        
-        ax.annotate(f"Savings:\n${savings_per_hour:.2f}\n({savings_pct:.1f}%)",
-                    xy=(savings_x, savings_y),
-                    ha='center', va='center',
-                    fontsize=12, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.5", fc="#90EE90", ec="#228B22", lw=2))
-
-    # Styling improvements
-    ax.set_ylabel("Cost per Effective Hour ($)", fontsize=14)
-    ax.set_ylim(0, max(costs[0], costs[1]) * 1.1)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.set_axisbelow(True)
-
-    # Set text color to white for better visibility
-    ax.tick_params(axis='x', colors='white', labelsize=12)
-    ax.tick_params(axis='y', colors='white', labelsize=11)
-    ax.spines['bottom'].set_color('white')
-    ax.spines['left'].set_color('white')
-    ax.yaxis.label.set_color('white')
-
-    # Improve spacing
-    plt.tight_layout()
-    st.pyplot(fig)
+with section("visual comparison"):
+    st.markdown(section_heading("🌐 Visual Comparison"), unsafe_allow_html=True)
+
+    # Create a container that fits well on a 15.6" screen
+    col1, col2, col3 = st.columns([1, 2, 1])  # Center the chart with padding on sides
+
+    with col2:
+        if chart_backend() == "plotly":
+            # Drawn in the browser; the server only sends the figure spec
+            chart_fig = comparison_chart_figure(cost_per_eff_hour, blended_hourly_cost, human_portion)
+            st.plotly_chart(chart_fig, width="stretch", theme=None, config={"displayModeBar": False})
+        else:
+            # Rendered once per distinct input and served from the chart cache afterwards
+            chart_png = comparison_chart_png(cost_per_eff_hour, blended_hourly_cost, human_portion)
+            st.image(chart_png, width="stretch")
 
 # —— Savings Row ———
-st.markdown("<div class='section-heading'>💰 Savings Summary</div>", unsafe_allow_html=True)
-s1, s2 = st.columns(2)
-with s1:
-    st.markdown(f"""
-        <div style="background-color: rgba(30, 70, 32, 0.8); padding: 20px; border-radius: 12px; font-size: 28px; font-weight: 700; color: #C8E6C9; margin-bottom: 20px; text-align: center;">
-        💵 Saving per Hour: ${savings_per_hour:.2f}
-        </div>
-    """, unsafe_allow_html=True)
-with s2:
-    st.markdown(f"""
-        <div style="background-color: rgba(30, 70, 32, 0.8); padding: 20px; border-radius: 12px; font-size: 28px; font-weight: 700; color: #C8E6C9; margin-bottom: 20px; text-align: center;">
-        📉 Saving Percentage: {savings_pct:.1f}%
-        </div>
-    """, unsafe_allow_html=True)
-
-# Add monthly and yearly projections
-days_month = 22  # Average working days per month
-months_year = 12
-
-# Calculate projections for blended approach
-monthly_human_cost = cost_day * days_month
-monthly_blended_cost = blended_hourly_cost * hours_day * days_month
-monthly_savings = (savings_per_hour * hours_day) * days_month
-
-yearly_human_cost = monthly_human_cost * months_year
-yearly_blended_cost = monthly_blended_cost * months_year
-yearly_savings = monthly_savings * months_year
-
-# Create columns for projections with transparent backgrounds
-proj1, proj2, proj3 = st.columns(3)
-
-with proj1:
-    st.markdown(f"""
-        <div style="background-color: rgba(42, 62, 104, 0.8); padding: 15px; border-radius: 10px; text-align: center; margin-bottom: 15px;">
-            <h4 style="color: #8BB8F8; margin: 0; font-size: 18px; font-weight: bold;">Daily</h4>
-            <p style="font-size: 22px; margin: 10px 0 5px;">
-                <span style='color:#C8E6C9;'>Savings: ${savings_per_hour * hours_day:.2f}</span>
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
-
-with proj2:
-    st.markdown(f"""
-        <div style="background-color: rgba(42, 62, 104, 0.8); padding: 15px; border-radius: 10px; text-align: center; margin-bottom: 15px;">
-            <h4 style="color: #8BB8F8; margin: 0; font-size: 18px; font-weight: bold;">Monthly</h4>
-            <p style="font-size: 22px; margin: 10px 0 5px;">
-                <span style='color:#C8E6C9;'>Savings: ${monthly_savings:.2f}</span>
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
-
-with proj3:
-    st.markdown(f"""
-        <div style="background-color: rgba(42, 62, 104, 0.8); padding: 15px; border-radius: 10px; text-align: center; margin-bottom: 15px;">
-            <h4 style="color: #8BB8F8; margin: 0; font-size: 18px; font-weight: bold;">Yearly</h4>
-            <p style="font-size: 22px; margin: 10px 0 5px;">
-                <span style='color:#C8E6C9;'>Savings: ${yearly_savings:,.2f}</span>
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
+with section("savings summary"):
+    st.markdown(section_heading("💰 Savings Summary"), unsafe_allow_html=True)
+    s1, s2 = st.columns(2)
+    with s1:
+        st.markdown(savings_card_html(f"💵 Saving per Hour: ${savings_per_hour:.2f}"), unsafe_allow_html=True)
+    with s2:
+        st.markdown(savings_card_html(f"📉 Saving Percentage: {savings_pct:.1f}%"), unsafe_allow_html=True)
+
+with section("projections"):
+    # Add monthly and yearly projections
+    monthly_savings = roi["monthly_savings"]
+    yearly_savings = roi["yearly_savings"]
+
+    # Create columns for projections with transparent backgrounds
+    proj1, proj2, proj3 = st.columns(3)
+    with proj1:
+        st.markdown(projection_card_html("Daily", f"${roi['daily_savings']:.2f}"), unsafe_allow_html=True)
+    with proj2:
+        st.markdown(projection_card_html("Monthly", f"${monthly_savings:.2f}"), unsafe_allow_html=True)
+    with proj3:
+        st.markdown(projection_card_html("Yearly", f"${yearly_savings:,.2f}"), unsafe_allow_html=True)
+
+# —— Sensitivity Heatmap ——
+with section("sensitivity heatmap"):
+    st.markdown(section_heading("🔥 Sensitivity: Utilization × Automation"), unsafe_allow_html=True)
+    st.write("Savings percentage for every utilization and automation level at the selected hourly rate, hours and AI tier. The outlined cell is the current selection.")
+
+    # Every slider combination in one vectorized pass
+    grid = sensitivity_grid_for(human_hourly, hours_day, selected_tier)
+
+    heat1, heat2, heat3 = st.columns([1, 2, 1])
+    with heat2:
+        if chart_backend() == "plotly":
+            heatmap_fig = sensitivity_heatmap_figure(grid, efficiency, automation_pct)
+            st.plotly_chart(heatmap_fig, width="stretch", theme=None, config={"displayModeBar": False})
+        else:
+            st.image(sensitivity_heatmap_png(grid, efficiency, automation_pct), width="stretch")
+
+# —— Goal Seek ——
+st.markdown(section_heading("🎯 Goal Seek"), unsafe_allow_html=True)
+
+goal_solve_options = {
+    "AI Automation Level (%)": "automation_pct",
+    "Human Agent Utilization (%)": "efficiency",
+    "Human Hourly Rate ($)": "human_hourly",
+}
+goal_metric_options = {"Saving Percentage (%)": "savings_pct", "Yearly Savings ($)": "yearly_savings"}
+
+# Solving for a target replaces dragging the sliders back and forth; reruns only this fragment
+@st.fragment
+def goal_seek_section(human_hourly, hours_day, efficiency, automation_pct, tier, agents):
+    with section("goal seek"):
+        with st.expander("Find the input that reaches a savings target, holding the other sidebar inputs fixed"):
+            g1, g2, g3 = st.columns(3)
+            with g1:
+                solve_label = st.selectbox("Solve for", list(goal_solve_options))
+            with g2:
+                metric_label = st.selectbox("Target", list(goal_metric_options))
+            metric = goal_metric_options[metric_label]
+            with g3:
+                targets_text = st.text_input("Target values (comma-separated)",
+                                             "30, 40, 50" if metric == "savings_pct" else "10000, 20000, 30000",
+                                             key=f"goal_targets_{metric}")
+            try:
+                targets = [float(value) for value in targets_text.replace("$", "").split(",") if value.strip()]
+            except ValueError:
+                st.warning("Targets must be numbers separated by commas.")
+                return
+
+            solve_for = goal_solve_options[solve_label]
+            result = goal_seek(solve_for, targets, metric, human_hourly, hours_day, efficiency, automation_pct,
+                               tier, agents)
+            scale = 1 if solve_for == "human_hourly" else 100
+            st.dataframe(pd.DataFrame({
+                "target": targets,
+                "value": result["value"] * scale,
+                "tier": [label.split(" (")[0] for label in result["tier"]],
+            }), width="stretch", hide_index=True, column_config={
+                "target": st.column_config.NumberColumn(metric_label,
+                                                        format="%.1f%%" if metric == "savings_pct" else "dollar"),
+                "value": st.column_config.NumberColumn(solve_label,
+                                                       format="dollar" if solve_for == "human_hourly" else "%.1f%%"),
+            })
+            if solve_for == "efficiency":
+                st.caption("Savings shrink as utilization rises, so each target holds at or below the utilization shown.")
+            if not result["feasible"].all():
+                st.caption("Blank rows can't be reached with the other inputs as they are.")
+
+goal_seek_section(human_hourly, hours_day, efficiency, automation_pct,
+                  "auto" if auto_tier else selected_tier, num_agents)
+
+# —— Multi-year Projection ——
+st.markdown(section_heading("📅 Multi-year Projection"), unsafe_allow_html=True)
+
+# A fragment: changing the ramp or horizon reruns only this section
+@st.fragment
+def projection_section(human_hourly, hours_day, efficiency, automation_pct, tier, agents):
+    with section("multi-year projection"):
+        # Only priced while open: on_change="rerun" keeps .open current when it is toggled
+        projection_expander = st.expander("Month-by-month savings with an automation ramp and a working-day calendar",
+                                          key="projection_expander", on_change="rerun")
+        with projection_expander:
+            st.write("Automation ramps linearly from the starting level to the sidebar level. Each month is priced on its own working days and, with automatic tier selection, at the tier of that month's AI volume.")
+            pr1, pr2, pr3, pr4 = st.columns(4)
+            with pr1:
+                years = st.select_slider("Horizon (years)", options=list(range(1, MAX_HORIZON_YEARS + 1)), value=3)
+            with pr2:
+                ramp_months = st.slider("Ramp-up (months)", min_value=0, max_value=24, value=6)
+            with pr3:
+                ramp_start = st.slider("Starting automation (%)", min_value=0, max_value=100, value=0, step=5) / 100
+            with pr4:
+                setup_cost = st.number_input("One-time setup cost ($)", value=0.0, min_value=0.0, step=500.0)
+            start_month = st.date_input("First month", value=pd.Timestamp.today().replace(day=1))
+            if not projection_expander.open:
+                return
+
+            months = years * 12
+            result, totals, frame = projection_for(human_hourly, hours_day, efficiency, automation_pct, tier, agents,
+                                                   years, ramp_months, ramp_start, setup_cost, start_month)
+            payback = int(result["payback_month"])
+            y1, y2, y3 = st.columns(3)
+            y1.metric(f"{years}-Year Savings", f"${result['cumulative_savings'][-1]:,.0f}")
+            y2.metric("Year 1 Savings", f"${totals['savings'][0]:,.0f}")
+            y3.metric("Payback", f"Month {payback}" if payback else f"Beyond {months} months")
+
+            st.line_chart(frame[["savings", "cumulative_savings"]])
+            st.dataframe(pd.DataFrame({
+                "year": range(1, years + 1),
+                "human_cost": totals["human_cost"],
+                "blended_cost": totals["blended_cost"],
+                "savings": totals["savings"],
+            }), width="stretch", hide_index=True, column_config={
+                "human_cost": st.column_config.NumberColumn("Human cost", format="dollar"),
+                "blended_cost": st.column_config.NumberColumn("Blended cost", format="dollar"),
+                "savings": st.column_config.NumberColumn("Savings", format="dollar"),
+            })
+
+projection_section(human_hourly, hours_day, efficiency, automation_pct,
+                   "auto" if auto_tier else selected_tier, num_agents)
+
+# —— Monte Carlo Simulation ——
+st.markdown(section_heading("🎲 Monte Carlo Simulation"), unsafe_allow_html=True)
+# A fragment: moving the simulation controls reruns only this section
+@st.fragment
+def monte_carlo_section(human_hourly, hours_day, efficiency, automation_pct, selected_tier):
+    with section("monte carlo"):
+        with st.expander("Yearly savings under uncertain utilization, absenteeism and automation"):
+            st.write("Utilization and automation are sampled around the sidebar values; absenteeism removes a share of paid hours from the hours actually worked.")
+            mc1, mc2, mc3, mc4 = st.columns(4)
+            with mc1:
+                efficiency_sd = st.slider("Utilization spread (± pts)", min_value=0, max_value=30, value=8) / 100
+            with mc2:
+                absenteeism_range = st.slider("Absenteeism range (%)", min_value=0, max_value=40, value=(7, 15))
+            with mc3:
+                automation_sd = st.slider("Automation spread (± pts)", min_value=0, max_value=30, value=10) / 100
+            with mc4:
+                n_samples = st.selectbox("Samples", [10_000, 100_000, 1_000_000], index=2, format_func=lambda n: f"{n:,}")
+
+            if st.checkbox("Run simulation", value=False):
+                sim = simulate_roi(human_hourly, hours_day, selected_tier, n=n_samples, seed=0, distributions={
+                    "efficiency": {"dist": "normal", "mean": efficiency, "sd": efficiency_sd},
+                    "absenteeism": {"dist": "uniform", "low": absenteeism_range[0] / 100, "high": absenteeism_range[1] / 100},
+                    "automation_pct": {"dist": "normal", "mean": automation_pct, "sd": automation_sd},
+                })
+
+                p1, p2, p3, p4 = st.columns(4)
+                p1.metric("P5 Yearly Savings", f"${sim['p5']:,.0f}")
+                p2.metric("P50 Yearly Savings", f"${sim['p50']:,.0f}")
+                p3.metric("P95 Yearly Savings", f"${sim['p95']:,.0f}")
+                p4.metric("Chance of Loss", f"{sim['prob_loss']*100:.1f}%")
+
+                counts, edges = savings_histogram(sim)
+                if chart_backend() == "plotly":
+                    hist_fig = simulation_histogram_figure(counts, edges, sim)
+                    st.plotly_chart(hist_fig, width="stretch", theme=None, config={"displayModeBar": False})
+                else:
+                    st.image(simulation_histogram_png(counts, edges, sim), width="stretch")
+
+monte_carlo_section(human_hourly, hours_day, efficiency, automation_pct, selected_tier)
+
+# —— Multi-site Portfolio ——
+st.markdown(section_heading("🏢 Portfolio"), unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_portfolio(sites):
+    # Sorting and filtering the breakdown reuse this result instead of recomputing it
+    sites = sites.assign(efficiency=sites["efficiency"] / 100, automation_pct=sites["automation_pct"] / 100)
+    return evaluate_portfolio(sites, workers=os.cpu_count() or 1)
+
+# Editing sites or filtering the breakdown reruns only this fragment
+@st.fragment
+def portfolio_section(human_hourly, hours_day, efficiency, automation_pct):
+    with section("portfolio"):
+        with st.expander("Per-site inputs, priced at the tier of the pooled AI volume"):
+            st.write("Edit the sites below or upload a CSV with columns site, human_hourly, hours_day, efficiency, automation_pct (both in %) and agents.")
+            sites_upload = st.file_uploader("Sites CSV", type="csv")
+            if sites_upload is not None:
+                sites_df = pd.read_csv(sites_upload)
+            else:
+                sites_df = pd.DataFrame({
+                    "site": ["Site A", "Site B", "Site C"],
+                    "human_hourly": [human_hourly, 17.0, 22.5],
+                    "hours_day": [hours_day, 8.0, 7.5],
+                    "efficiency": [efficiency * 100, 60.0, 70.0],
+                    "automation_pct": [automation_pct * 100, 40.0, 60.0],
+                    "agents": [10, 25, 15],
+                })
+            sites_df = st.data_editor(sites_df, num_rows="dynamic", width="stretch", key="portfolio_sites")
+
+            try:
+                portfolio_breakdown, portfolio_totals = cached_portfolio(sites_df.dropna())
+            except (KeyError, ValueError) as e:
+                st.warning(f"Cannot price portfolio: {e}")
+            else:
+                t1, t2, t3, t4 = st.columns(4)
+                t1.metric("Pooled AI Volume", f"{portfolio_totals['monthly_ai_minutes']:,.0f} min/mo")
+                t2.metric("Pooled Tier", portfolio_totals["tier"].split(" (")[0])
+                t3.metric("Monthly Savings", f"${portfolio_totals['monthly_savings']:,.0f}")
+                t4.metric("Yearly Savings", f"${portfolio_totals['yearly_savings']:,.0f}",
+                          f"{portfolio_totals['savings_pct']:.1f}%")
+
+                site_filter = st.text_input("Filter sites", "")
+                shown = portfolio_breakdown
+                if site_filter:
+                    shown = shown[shown["site"].astype(str).str.contains(site_filter, case=False, regex=False)]
+                st.dataframe(shown, width="stretch", hide_index=True, column_config={
+                    "monthly_ai_minutes": st.column_config.NumberColumn("AI min/month", format="localized"),
+                    "cost_per_eff_hour": st.column_config.NumberColumn("Cost/eff. hour", format="dollar"),
+                    "blended_hourly_cost": st.column_config.NumberColumn("Blended/hour", format="dollar"),
+                    "savings_per_hour": st.column_config.NumberColumn("Savings/hour", format="dollar"),
+                    "savings_pct": st.column_config.NumberColumn("Savings %", format="%.1f%%"),
+                    "daily_savings": st.column_config.NumberColumn("Daily savings", format="dollar"),
+                    "monthly_savings": st.column_config.NumberColumn("Monthly savings", format="dollar"),
+                    "yearly_savings": st.column_config.NumberColumn("Yearly savings", format="dollar"),
+                    "monthly_human_cost": st.column_config.NumberColumn("Monthly human cost", format="dollar"),
+                    "monthly_blended_cost": st.column_config.NumberColumn("Monthly blended cost", format="dollar"),
+                })
+
+portfolio_section(human_hourly, hours_day, efficiency, automation_pct)
+
+# —— Proposal Export ——
+st.markdown(section_heading("📄 Proposal Export"), unsafe_allow_html=True)
+
+# Rendering happens in the export worker pool; this fragment only submits and polls
+@st.fragment
+def export_section(human_hourly, hours_day, efficiency, automation_pct, tier, agents):
+    with section("proposal export"):
+        with st.expander("Branded PDF, PNG or XLSX proposal with the breakdown table, chart and projections"):
+            e1, e2 = st.columns(2)
+            with e1:
+                client_name = st.text_input("Client name", "")
+            with e2:
+                export_format = st.selectbox("Format", list(EXPORT_FORMATS), format_func=str.upper)
+            export_upload = st.file_uploader("Scenarios CSV for bulk export (optional): same columns as the portfolio, plus an optional name", type="csv", key="export_scenarios")
+
+            if st.button("Generate proposal"):
+                try:
+                    if export_upload is not None:
+                        scenarios = scenarios_from_frame(pd.read_csv(export_upload))
+                    else:
+                        scenarios = [proposal_scenario(human_hourly, hours_day, efficiency, automation_pct, tier,
+                                                       agents, client_name)]
+                    st.session_state.export_job = export_queue().submit(scenarios, export_format)
+                except (KeyError, ValueError) as e:
+                    st.warning(f"Cannot export: {e}")
+
+            job_id = st.session_state.get("export_job")
+            status = export_queue().status(job_id) if job_id else None
+            if status is None:
+                return
+            # Waiting here only holds this fragment; any widget change interrupts it and the job carries on
+            progress = st.empty()
+            while status["state"] in ("queued", "running"):
+                progress.progress(status["progress"], text=f"Rendering {status['scenarios']:,} {status['format'].upper()} proposal(s)...")
+                time.sleep(0.25)
+                status = export_queue().status(job_id)
+            progress.empty()
+            if status["state"] == "failed":
+                st.error(f"Export failed: {status['error']}")
+            else:
+                file_name, mime, data = export_queue().result(job_id)
+                st.download_button(f"Download {file_name}", data, file_name=file_name, mime=mime)
+
+export_section(human_hourly, hours_day, efficiency, automation_pct, "auto" if auto_tier else selected_tier, num_agents)
 
 # —— Footer ——
 st.markdown("---")
 
 # ─── Improved FAQ Section - With Tabs for Organization ────────────────────
-st.write("## Frequently Asked Questions")
-
-# Simple text description with larger font
-st.write("#### Common questions about AI automation and how it can benefit your contact center operations.")
-
-# Use tabs to organize FAQs without nesting expanders
-faq_tabs = st.tabs([
-    "Why Choose AI", 
-    "Cost Savings", 
-    "Implementation", 
-    "Capabilities",
-    "Getting Started"
-])
-
-# Tab 1: Why Choose AI
-with faq_tabs[0]:
-    st.write("### Why Businesses Are Switching to AI Voice Agents")
-    
-    st.write("**What exactly is an AI Voice Representative?**")
-    st.write("""
-    AI Voice Representatives are cutting-edge virtual agents that revolutionize how businesses handle communications. They conduct remarkably natural phone conversations, answer complex questions, process requests, and deliver consistent excellence 24/7/365.
-    
-    Unlike human agents who need breaks, vacations, and sick days, our AI Voice Representatives work around the clock with zero downtime, zero turnover, and zero training requirements—transforming your customer service from a cost center into a competitive advantage.
-    """)
-    
-    st.write("**How do AI Voice Agents differ from traditional IVR systems?**")
-    st.write("""
-    Unlike traditional IVR systems that force callers through rigid menu trees, our AI Voice Agents engage in natural conversations. They don't just recognize keywords—they understand intent, can handle complex inquiries, and provide personalized responses that sound human, creating a dramatically improved customer experience.
-    """)
-
-# Tab 2: Cost & Efficiency
-with faq_tabs[1]:
-    st.write("### Cost Savings & Operational Efficiency")
-    
-    st.write("**What kind of cost savings can I expect?**")
-    st.write("""
-    Businesses typically slash communication costs by 50-70% when implementing AI Voice Agents. Beyond the obvious savings on salaries and benefits, you'll eliminate costly overhead from:
-
-    - Recruitment & Turnover Costs: No more spending thousands on hiring replacements for the average 30-45% annual call center attrition
-    - Training Expenses: Eliminate the 2-6 weeks of paid training for each new agent
-    - Absenteeism & No-Shows: The average call center loses 7-15% of scheduled hours to unexpected absences and no-shows
-    - Management Overhead: Reduce supervisory staff needed for scheduling, quality monitoring, and performance management
-    
-    Use our ROI calculator above to see your specific savings potential.
-    """)
-    
-    st.write("**How do AI Voice Agents improve operational efficiency?**")
-    st.write("""
-    Our AI Voice Agents transform your operation with:
-
-    - 24/7/365 Availability: Never miss another call, even at 3 AM or during holidays
-    - Infinite Scalability: Handle sudden call spikes without scrambling to staff up
-    - Zero Ramp-Up Time: Deploy additional capacity instantly during seasonal peaks
-    - Perfect Consistency: Every caller receives the same high-quality experience
-    - Zero Burnout: Unlike humans, AI agents maintain peak performance regardless of call volume or complexity
-    - Instant Knowledge Updates: New information is available across all AI agents simultaneously without training sessions
-    """)
-    
-    st.write("**What happens to my business when calls go unanswered?**")
-    st.write("""
-    Every missed call is potentially thousands in lost revenue. Studies show:
-
-    - 85% of customers whose calls go unanswered will not call back
-    - 75% of callers will form a negative impression of your business from unanswered calls
-    - The average missed sales call represents $1,200-$4,800 in lost potential revenue
-    
-    Our AI Voice Agents ensure every call is answered promptly, even during peak hours, nights, weekends, and holidays – capturing revenue that would otherwise be lost.
-    """)
-
-# Tab 3: Implementation & Integration
-with faq_tabs[2]:
-    st.write("### Implementation & Integration")
-    
-    st.write("**How long does it take to implement AI Voice Agents?**")
-    st.write("""
-    Implementation timelines depend on the specific product type you choose and your business requirements. Many of our solutions can be deployed rapidly with minimal setup time.
-    
-    Typical implementation timelines:
-    - Basic phone automation: 2-3 weeks
-    - Complex integrations: 4-8 weeks
-    - Enterprise-wide deployment: 8-12 weeks
-    
-    We work closely with your team to ensure a smooth transition with minimal disruption to your operations.
-    """)
-    
-    st.write("**Will AI Voice Agents integrate with my existing systems?**")
-    st.write("""
-    Absolutely! Our flexible integration framework connects with virtually any business system you're currently using. Whether it's a popular CRM like Salesforce, your proprietary databases, or legacy phone systems, we design custom integration pathways that make implementation smooth and non-disruptive.
-    
-    Our system works with:
-    - All major CRM platforms (Salesforce, Microsoft Dynamics, HubSpot, etc.)
-    - Custom databases and legacy systems
-    - VoIP and traditional phone systems
-    - Ticketing systems (Zendesk, ServiceNow, etc.)
-    - Knowledge bases and information repositories
-    """)
-
-# Tab 4: Capabilities & Limitations
-with faq_tabs[3]:
-    st.write("### Capabilities & Customer Experience")
-    
-    st.write("**What types of calls can AI Voice Agents handle effectively?**")
-    st.write("""
-    Our AI Voice Agents excel at handling appointment scheduling, customer service inquiries, order status updates, product information requests, lead qualification, and routine transactions. They're particularly effective for high-volume, repetitive call types that follow predictable patterns.
-    """)
-    
-    st.write("**How do AI Voice Agents handle complex or unusual customer requests?**")
-    st.write("""
-    Our AI Voice Agents are designed to recognize when a conversation exceeds their capabilities. In these situations, they seamlessly transfer the call to a human agent, providing a complete transcript and summary of the conversation so the human agent can pick up exactly where the AI left off—creating a smooth customer experience.
-    """)
-    
-    st.write("**Can AI Voice Agents make outbound calls too?**")
-    st.write("""
-    Absolutely! Our AI Voice Agents can conduct outbound calling campaigns for appointment reminders, payment collection, satisfaction surveys, lead qualification, and promotional offers. They can reach hundreds of customers simultaneously with personalized conversations that drive results.
-    """)
-    
-    st.write("**How natural do the AI Voice Agents sound?**")
-    st.write("""
-    Our advanced AI technology produces remarkably natural-sounding voices that many callers cannot distinguish from humans. The agents understand context, respond to emotional cues, adjust their tone appropriately, and can even insert thoughtful pauses and conversational fillers for an authentic experience.
-    """)
-    
-    st.write("**What languages do your AI Voice Agents support?**")
-    st.write("""
-    Our AI Voice Agents currently support over 25 languages including English, Spanish, French, German, Italian, Portuguese, Mandarin, Japanese, and Arabic. Each language version maintains natural intonation and cultural nuances for an authentic experience regardless of region.
-    """)
-
-# Tab 5: Getting Started
-with faq_tabs[4]:
-    st.write("### Getting Started & Pricing")
-    
-    st.write("**How is pricing structured for AI Voice Agents?**")
-    st.write("""
-    Our pricing models are designed to provide predictability and transparency:
-
-    - Monthly subscription based on usage volume
-    - Per-minute rates for active AI conversation time
-    - One-time implementation and integration fee
-    
-    Most clients see ROI within the first month of deployment. The calculator above demonstrates how the savings typically far exceed the investment.
-    """)
-    
-    st.write("**What's the first step in getting started with AI Voice Agents?**")
-    st.write("""
-    The process begins with a consultation where we:
-    
-    1. Assess your current call operations
-    2. Identify opportunities for AI implementation
-    3. Provide a customized proposal with expected cost savings
-    4. Create an implementation timeline
-    5. Develop an integration plan for your existing systems
-    
-    We typically begin with a pilot program focused on a specific call type to demonstrate value before expanding to additional use cases.
-    """)
-    
-    st.write("**How can I see your AI Voice Agents in action?**")
-    st.write("""
-    We offer several ways to experience our AI Voice Agents firsthand:
-    
-    - Live demonstration with your specific use cases
-    - Sample recordings of AI conversations
-    - Pilot program with limited scope to prove the concept
-    - References from existing clients in your industry
-    
-    This gives you the opportunity to evaluate the technology with your own requirements before making a decision.
-    """)
+with section("faq"):
+    st.write("## Frequently Asked Questions")
+
+    # Simple text description with larger font
+    st.write("#### Common questions about AI automation and how it can benefit your contact center operations.")
+
+    # Use tabs to organize FAQs without nesting expanders
+    faq_tab_containers = st.tabs([title for title, _ in faq_tabs])
+    for tab, (_, faq_markdown) in zip(faq_tab_containers, faq_tabs):
+        with tab:
+            st.markdown(faq_markdown)
 
 # Add some spacing at the bottom
 st.write("")
+
+# —— Debug Panel ——
+if instrumented:
+    record("total run", time.perf_counter() - run_started)
+    render_debug_panel(st)
@@ -0,0 +1,126 @@
+import base64
+import os
+import shutil
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# —— Process-wide Asset Cache ——
+# Streamlit reruns the script on every widget change but imports this module once
+# per process, so encoded images survive across reruns and sessions.
+_cache = {}  # absolute path -> (mtime_ns, base64 string)
+_stats = {"hits": 0, "misses": 0, "stale": 0}
+_lock = threading.Lock()
+
+
+def encode_png_base64(image_path):
+    with open(image_path, "rb") as f:
+        raw = f.read()
+
+    # Files that are already PNG are sent as-is instead of being decoded and re-saved
+    if not raw.startswith(PNG_SIGNATURE):
+        img = Image.open(BytesIO(raw))
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+        raw = buf.getvalue()
+    return base64.b64encode(raw).decode()
+
+
+def get_base64_image(image_path):
+    # Raises FileNotFoundError like open() when the image is missing
+    path = os.path.abspath(image_path)
+    mtime = os.stat(path).st_mtime_ns
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == mtime:
+            _stats["hits"] += 1
+            return entry[1]
+        if entry is not None:
+            # File changed on disk since it was encoded
+            del _cache[path]
+            _stats["stale"] += 1
+        _stats["misses"] += 1
+
+    encoded = encode_png_base64(path)
+    with _lock:
+        _cache[path] = (mtime, encoded)
+    return encoded
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_cache), bytes=sum(len(b64) for _, b64 in _cache.values()))
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+# —— Static Asset Publishing ——
+# With server.enableStaticServing, Streamlit serves <app dir>/static/ at app/static/.
+# Images published there are fetched once by the browser (and revalidated via
+# ETag/Last-Modified) instead of riding along as base64 in every page delta.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+
+# Source image -> largest size it is displayed at (None publishes it unchanged)
+static_assets = {
+    "connexus_logo.png": (1000, 120),  # sidebar logo, max-height 60px at 2x
+    "connexus_logo_watermark.png": (800, 800),  # .watermark box
+    "favicon-16x16.png": None,
+    "favicon-32x32.png": None,
+    "apple-touch-icon.png": None,
+    "android-chrome-192x192.png": None,
+    "android-chrome-512x512.png": None,
+}
+
+_published = {}  # source path -> (mtime_ns, url)
+
+
+def publish_static_asset(image_path, max_size=None):
+    # Copies (or downscales) image_path into STATIC_DIR and returns its URL.
+    # The ?v= suffix changes with the source mtime so browsers never keep a stale copy.
+    path = os.path.abspath(image_path)
+    mtime = os.stat(path).st_mtime_ns
+
+    with _lock:
+        entry = _published.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+    name = os.path.basename(path)
+    target = os.path.join(STATIC_DIR, name)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+
+    # Write to a temp file first so concurrent sessions never serve a half-written image
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if max_size is None:
+        shutil.copyfile(path, tmp)
+    else:
+        img = Image.open(path)
+        img.thumbnail(max_size, Image.LANCZOS)
+        img.save(tmp, format="PNG", optimize=True)
+    os.replace(tmp, target)
+
+    url = f"{STATIC_URL}/{name}?v={mtime}"
+    with _lock:
+        _published[path] = (mtime, url)
+    return url
+
+
+def publish_static_assets(base_dir=None):
+    # Publishes every entry of static_assets found in base_dir; returns {name: url}
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    urls = {}
+    for name, max_size in static_assets.items():
+        path = os.path.join(base_dir, name)
+        if os.path.exists(path):
+            urls[name] = publish_static_asset(path, max_size)
+    return urls
@@ -0,0 +1,237 @@
+"""Reproducible performance benchmarks for the calculator.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --only roi_throughput chart_render
+
+Results are written as JSON so runs from different releases can be diffed.
+Benchmarks: cold_start, rerun, image_encoding, chart_render, roi_throughput.
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+from instrumentation import current_rss_bytes
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+
+cold_start_imports = ["streamlit", "matplotlib.pyplot", "plotly.graph_objects", "PIL.Image", "numpy", "pandas"]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "min": samples[0],
+        "max": samples[-1],
+    }
+
+
+def _time_in_fresh_interpreter(code, repeat):
+    # Wall seconds for code in a new interpreter, so nothing is already imported
+    script = f"import time\nt = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)"
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", script], cwd=APP_DIR, capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return summarize(samples)
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# —— Benchmarks ——
+def bench_cold_start(repeat=3, **_):
+    results = {name: _time_in_fresh_interpreter(f"import {name}", repeat) for name in cold_start_imports}
+    # Full first run of app.py: imports, page build and every section
+    results["app_first_run"] = _time_in_fresh_interpreter(
+        "from streamlit.testing.v1 import AppTest\n"
+        f"AppTest.from_file({APP_PATH!r}, default_timeout=120).run()", repeat)
+    return results
+
+
+def bench_rerun(reruns=30, seed=0, **_):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+
+    times, allocations = [], []
+    tracemalloc.start()
+    for _ in range(reruns):
+        at.sidebar.slider[0].set_value(rng.randrange(0, 101, 5))
+        at.sidebar.slider[1].set_value(rng.randrange(0, 101, 5))
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        allocations.append(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"app.py raised during rerun benchmark: {at.exception[0].message}")
+    return {"wall_seconds": summarize(times), "peak_alloc_bytes": summarize(allocations)}
+
+
+def bench_image_encoding(repeat=20, **_):
+    import assets
+    from PIL import Image
+
+    def legacy(path):
+        # The original load_base64_image body: PIL decode and PNG re-encode every call
+        img = Image.open(path)
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+        return base64.b64encode(buf.getvalue()).decode()
+
+    results = {}
+    for name in ("connexus_logo.png", "connexus_logo_watermark.png"):
+        path = os.path.join(APP_DIR, name)
+        assets.clear_cache()
+        assets.get_base64_image(path)
+        results[name] = {
+            "legacy_pil_roundtrip": summarize(_timed(lambda: legacy(path), repeat)),
+            "uncached_encode": summarize(_timed(lambda: assets.encode_png_base64(path), repeat)),
+            "cached_lookup": summarize(_timed(lambda: assets.get_base64_image(path), repeat)),
+        }
+    return results
+
+
+def bench_chart_render(repeat=20, leak_runs=50, **_):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    # The legacy path below leaks figures on purpose; don't warn about it
+    matplotlib.rcParams["figure.max_open_warning"] = 0
+    import matplotlib.pyplot as plt
+
+    import charts
+
+    results = {
+        "uncached_render": summarize(_timed(lambda: charts.render_comparison_png(30.0, 20.4, 0.5), repeat)),
+    }
+    charts.clear_chart_cache()
+    charts.comparison_chart_png(30.0, 20.4, 0.5)
+    results["cached_lookup"] = summarize(_timed(lambda: charts.comparison_chart_png(30.0, 20.4, 0.5), repeat))
+
+    # Leak growth: the original plt.subplots() per rerun, never closed, vs the chart renderer
+    def legacy(i):
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.bar(['100% Human', 'Blended'], [30.0 + i, 20.4])
+        fig.savefig(BytesIO(), format="png", bbox_inches="tight", dpi=200)
+
+    def current(i):
+        charts.render_comparison_png(30.0 + i, 20.4, 0.5)
+
+    for name, fn in (("legacy_pyplot", legacy), ("chart_renderer", current)):
+        plt.close("all")
+        figures_before, rss_before = len(plt.get_fignums()), current_rss_bytes()
+        for i in range(leak_runs):
+            fn(i)
+        results[f"{name}_leak"] = {
+            "runs": leak_runs,
+            "open_figures": len(plt.get_fignums()) - figures_before,
+            "rss_growth_bytes": current_rss_bytes() - rss_before,
+        }
+    plt.close("all")
+    return results
+
+
+def bench_roi_throughput(rows=1_000_000, scalar_rows=100_000, **_):
+    import numpy as np
+
+    from roi_engine import calculate_roi, calculate_roi_batch, tier_labels
+
+    rng = np.random.default_rng(0)
+    human_hourly = rng.uniform(10, 40, rows)
+    hours_day = rng.choice([4.0, 6.0, 8.0, 10.0], rows)
+    efficiency = rng.integers(0, 21, rows) / 20
+    automation_pct = rng.integers(0, 21, rows) / 20
+    tiers = rng.choice(np.array(tier_labels, dtype=object), rows)
+
+    start = time.perf_counter()
+    for i in range(scalar_rows):
+        calculate_roi(human_hourly[i], hours_day[i], efficiency[i], automation_pct[i], tiers[i])
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculate_roi_batch(human_hourly, hours_day, efficiency, automation_pct, tiers)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "scalar": {"rows": scalar_rows, "seconds": scalar_seconds, "rows_per_sec": scalar_rows / scalar_seconds},
+        "batch": {"rows": rows, "seconds": batch_seconds, "rows_per_sec": rows / batch_seconds},
+    }
+
+
+benchmarks = {
+    "cold_start": bench_cold_start,
+    "rerun": bench_rerun,
+    "image_encoding": bench_image_encoding,
+    "chart_render": bench_chart_render,
+    "roi_throughput": bench_roi_throughput,
+}
+
+
+def environment():
+    versions = {}
+    for name in ("streamlit", "matplotlib", "plotly", "PIL", "numpy", "pandas"):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ConnexUS ROI calculator.")
+    parser.add_argument("--only", nargs="+", choices=list(benchmarks), help="benchmarks to run (default: all)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--reruns", type=int, default=30, help="AppTest reruns for the rerun benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows for the batch ROI benchmark")
+    args = parser.parse_args(argv)
+
+    # Benchmarks import app modules and resolve relative asset paths from here
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+
+    report = {"environment": environment(), "results": {}}
+    for name in args.only or benchmarks:
+        print(f"Running {name}...", file=sys.stderr)
+        report["results"][name] = benchmarks[name](reruns=args.reruns, rows=args.rows)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+
+from scenario_store import result_store
+
+# matplotlib and plotly are both heavy imports; each is only loaded the first
+# time its backend actually draws something.
+CHART_BACKENDS = ("plotly", "matplotlib")
+
+bar_colors = ['#FF6B6B', '#4D96FF']
+
+# Same output st.pyplot produced before (bbox_inches="tight", dpi=200)
+SAVEFIG_KWARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+# —— Rendered Chart Cache ——
+# PNG bytes keyed by the rounded chart inputs. Bounded by total bytes rather than
+# entry count so a ceiling maps directly to server memory.
+CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024
+KEY_DECIMALS = 4
+
+_renders = OrderedDict()  # key -> png bytes, least recently used first
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+_cache_lock = threading.Lock()
+
+# One Figure/Axes pair is built once and redrawn for every render. It never goes
+# through pyplot, so nothing is registered globally and nothing needs plt.close().
+_template = None
+_render_lock = threading.Lock()
+
+
+def _reset_locks_after_fork():
+    # A worker forked while another thread held a lock would inherit it held forever
+    global _cache_lock, _render_lock
+    _cache_lock = threading.Lock()
+    _render_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def chart_key(cost_per_eff_hour, blended_hourly_cost, human_portion):
+    return (round(cost_per_eff_hour, KEY_DECIMALS),
+            round(blended_hourly_cost, KEY_DECIMALS),
+            round(human_portion, KEY_DECIMALS))
+
+
+def chart_backend():
+    # "plotly" draws in the browser; "matplotlib" rasterizes on the server
+    backend = os.environ.get("CONNEXUS_CHART_BACKEND", "plotly")
+    if backend not in CHART_BACKENDS:
+        raise ValueError(f"Unknown chart backend: {backend!r}")
+    return backend
+
+
+def _get_template():
+    global _template
+    if _template is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        _template = (fig, ax)
+    return _template
+
+
+def _comparison_values(cost_per_eff_hour, blended_hourly_cost, human_portion):
+    ai_portion = 1 - human_portion
+    savings_per_hour = cost_per_eff_hour - blended_hourly_cost
+    savings_pct = (savings_per_hour / cost_per_eff_hour * 100) if cost_per_eff_hour > 0 else 0
+    labels = ['100% Human', f'{human_portion*100:.0f}% Human +\n{ai_portion*100:.0f}% AI']
+    return labels, [cost_per_eff_hour, blended_hourly_cost], savings_per_hour, savings_pct
+
+
+def _draw_comparison(fig, ax, cost_per_eff_hour, blended_hourly_cost, human_portion):
+    labels, costs, savings_per_hour, savings_pct = _comparison_values(
+        cost_per_eff_hour, blended_hourly_cost, human_portion)
+
+    ax.clear()
+    # Set transparent background
+    fig.patch.set_alpha(0)
+    ax.patch.set_alpha(0)
+
+    bars = ax.bar(labels, costs, color=bar_colors, width=0.6, edgecolor='#FF6700', linewidth=2)
+
+    # Add cost labels in the middle of the bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, height/2,
+                f"${height:.2f}",
+                ha='center', va='center',
+                fontsize=16, fontweight='bold', color='white')
+
+    # Position savings box between the bars
+    savings_x = (bars[0].get_x() + bars[0].get_width() + bars[1].get_x()) / 2
+    savings_y = max(costs) * 0.8
+    ax.annotate(f"Savings:\n${savings_per_hour:.2f}\n({savings_pct:.1f}%)",
+                xy=(savings_x, savings_y),
+                ha='center', va='center',
+                fontsize=12, fontweight='bold',
+                bbox=dict(boxstyle="round,pad=0.5", fc="#90EE90", ec="#228B22", lw=2))
+
+    # Styling improvements
+    ax.set_ylabel("Cost per Effective Hour ($)", fontsize=14)
+    if max(costs) > 0:
+        ax.set_ylim(0, max(costs) * 1.1)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.set_axisbelow(True)
+
+    # Set text color to white for better visibility
+    ax.tick_params(axis='x', colors='white', labelsize=12)
+    ax.tick_params(axis='y', colors='white', labelsize=11)
+    ax.spines['bottom'].set_color('white')
+    ax.spines['left'].set_color('white')
+    ax.yaxis.label.set_color('white')
+
+    fig.tight_layout()
+
+
+def render_comparison_png(cost_per_eff_hour, blended_hourly_cost, human_portion):
+    # Uncached render of the Visual Comparison bar chart
+    with _render_lock:
+        fig, ax = _get_template()
+        _draw_comparison(fig, ax, cost_per_eff_hour, blended_hourly_cost, human_portion)
+        buf = BytesIO()
+        fig.savefig(buf, **SAVEFIG_KWARGS)
+        ax.clear()
+    return buf.getvalue()
+
+
+def _cached_render(key, render):
+    # Shared byte-bounded LRU for every server-rendered chart; render() runs on a miss
+    with _cache_lock:
+        png = _renders.get(key)
+        if png is not None:
+            _renders.move_to_end(key)
+            _stats["hits"] += 1
+            return png
+        _stats["misses"] += 1
+
+    png = render()
+    with _cache_lock:
+        if key not in _renders:
+            _renders[key] = png
+            _stats["bytes"] += len(png)
+            while _stats["bytes"] > CHART_CACHE_MAX_BYTES and len(_renders) > 1:
+                _, evicted = _renders.popitem(last=False)
+                _stats["bytes"] -= len(evicted)
+                _stats["evictions"] += 1
+    return png
+
+
+def comparison_chart_png(cost_per_eff_hour, blended_hourly_cost, human_portion):
+    key = chart_key(cost_per_eff_hour, blended_hourly_cost, human_portion)
+
+    def render():
+        # Render from the rounded key so every hit returns exactly what a miss would draw.
+        # Misses fall through to the on-disk result store before rendering.
+        store = result_store()
+        if store is None:
+            return render_comparison_png(*key)
+        return store.get_or_create("comparison_png", list(key), lambda: render_comparison_png(*key))
+
+    return _cached_render(key, render)
+
+
+def chart_cache_stats():
+    with _cache_lock:
+        return dict(_stats, entries=len(_renders), max_bytes=CHART_CACHE_MAX_BYTES)
+
+
+def clear_chart_cache():
+    with _cache_lock:
+        _renders.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+# —— Plotly Backend ——
+def comparison_chart_figure(cost_per_eff_hour, blended_hourly_cost, human_portion):
+    # Same chart as render_comparison_png, drawn client-side by plotly.js
+    import plotly.graph_objects as go
+
+    labels, costs, savings_per_hour, savings_pct = _comparison_values(
+        *chart_key(cost_per_eff_hour, blended_hourly_cost, human_portion))
+    labels = [label.replace('\n', '<br>') for label in labels]
+
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=costs,
+        width=0.6,
+        marker=dict(color=bar_colors, line=dict(color='#FF6700', width=2)),
+        text=[f"${cost:.2f}" for cost in costs],
+        textposition='inside',
+        insidetextanchor='middle',
+        textfont=dict(size=16, color='white', weight='bold'),
+        hoverinfo='skip',
+    ))
+
+    # Savings box between the bars
+    fig.add_annotation(
+        x=0.5, y=max(costs) * 0.8, xref='x', yref='y',
+        text=f"<b>Savings:<br>${savings_per_hour:.2f}<br>({savings_pct:.1f}%)</b>",
+        showarrow=False,
+        font=dict(size=13, color='black'),
+        bgcolor='#90EE90', bordercolor='#228B22', borderwidth=2, borderpad=6,
+    )
+
+    fig.update_layout(
+        height=450,
+        margin=dict(l=60, r=20, t=20, b=60),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        font=dict(color='white'),
+    )
+    fig.update_xaxes(tickfont=dict(size=14, color='white'), showline=True, linecolor='white', linewidth=1)
+    fig.update_yaxes(
+        title=dict(text="Cost per Effective Hour ($)", font=dict(size=16, color='white')),
+        tickfont=dict(size=13, color='white'),
+        range=[0, max(costs) * 1.1] if max(costs) > 0 else None,
+        showline=True, linecolor='white', linewidth=1,
+        showgrid=False, zeroline=False,
+    )
+    return fig
+
+
+# —— Sensitivity Heatmap ——
+def sensitivity_heatmap_figure(grid, efficiency=None, automation_pct=None):
+    # Savings % over the utilization x automation grid; hover also shows $/hour
+    import plotly.graph_objects as go
+
+    x = [f"{level*100:.0f}%" for level in grid["automation_pct"]]
+    y = [f"{level*100:.0f}%" for level in grid["efficiency"]]
+    fig = go.Figure(go.Heatmap(
+        x=x,
+        y=y,
+        z=grid["savings_pct"],
+        customdata=grid["savings_per_hour"],
+        colorscale='RdYlGn',
+        zmid=0,
+        colorbar=dict(title=dict(text="Savings %", font=dict(color='white')), tickfont=dict(color='white')),
+        hovertemplate="Automation %{x}<br>Utilization %{y}<br>"
+                      "Savings: $%{customdata:.2f}/hr (%{z:.1f}%)<extra></extra>",
+    ))
+
+    # Mark the sidebar selection
+    if efficiency is not None and automation_pct is not None:
+        fig.add_trace(go.Scatter(
+            x=[f"{automation_pct*100:.0f}%"], y=[f"{efficiency*100:.0f}%"],
+            mode='markers',
+            marker=dict(symbol='square-open', size=18, color='white', line=dict(width=3)),
+            hoverinfo='skip', showlegend=False,
+        ))
+
+    fig.update_layout(
+        height=500,
+        margin=dict(l=60, r=20, t=20, b=60),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+    )
+    fig.update_xaxes(title=dict(text="AI Automation Level (%)", font=dict(size=14)), tickfont=dict(color='white'))
+    fig.update_yaxes(title=dict(text="Human Agent Utilization (%)", font=dict(size=14)), tickfont=dict(color='white'))
+    return fig
+
+
+def sensitivity_heatmap_png(grid, efficiency=None, automation_pct=None):
+    # Server-side variant of sensitivity_heatmap_figure, cached like comparison_chart_png:
+    # keyed on the rounded grid and the outlined cell, and drawn from those rounded values.
+    levels = {name: np.round(np.asarray(grid[name], dtype=float), KEY_DECIMALS)
+              for name in ("efficiency", "automation_pct", "savings_pct")}
+    cell = (None if efficiency is None or automation_pct is None
+            else (round(efficiency, KEY_DECIMALS), round(automation_pct, KEY_DECIMALS)))
+    key = ("sensitivity_heatmap", levels["savings_pct"].shape,
+           *(values.tobytes() for values in levels.values()), cell)
+    return _cached_render(key, lambda: render_sensitivity_heatmap_png(levels, *(cell or (None, None))))
+
+
+def render_sensitivity_heatmap_png(grid, efficiency=None, automation_pct=None):
+    # Uncached render. A fresh Figure per call, outside pyplot, is garbage
+    # collected as soon as the PNG is written.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import TwoSlopeNorm
+    from matplotlib.figure import Figure
+
+    automation = grid["automation_pct"] * 100
+    utilization = grid["efficiency"] * 100
+    z = grid["savings_pct"]
+    step = automation[1] - automation[0] if len(automation) > 1 else 5
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_subplot()
+
+    vmin, vmax = min(z.min(), -1e-9), max(z.max(), 1e-9)
+    image = ax.imshow(z, origin='lower', aspect='auto', cmap='RdYlGn',
+                      norm=TwoSlopeNorm(vcenter=0, vmin=vmin, vmax=vmax),
+                      extent=(automation[0] - step/2, automation[-1] + step/2,
+                              utilization[0] - step/2, utilization[-1] + step/2))
+    if efficiency is not None and automation_pct is not None:
+        ax.plot(automation_pct * 100, efficiency * 100, marker='s', markersize=14,
+                markerfacecolor='none', markeredgecolor='white', markeredgewidth=2.5)
+
+    colorbar = fig.colorbar(image, ax=ax)
+    colorbar.set_label("Savings %", color='white')
+    colorbar.ax.tick_params(colors='white')
+
+    ax.set_xlabel("AI Automation Level (%)", fontsize=12, color='white')
+    ax.set_ylabel("Human Agent Utilization (%)", fontsize=12, color='white')
+    ax.tick_params(colors='white')
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, **SAVEFIG_KWARGS)
+    return buf.getvalue()
+
+
+# —— Monte Carlo Histogram ——
+percentile_colors = {"p5": '#FF6B6B', "p50": '#00FFAA', "p95": '#4D96FF'}
+
+
+def simulation_histogram_figure(counts, edges, result):
+    # Pre-binned yearly savings with P5/P50/P95 markers
+    import plotly.graph_objects as go
+
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure(go.Bar(
+        x=centers, y=counts, width=edges[1] - edges[0],
+        marker=dict(color='#4D96FF', line=dict(width=0)),
+        hovertemplate="$%{x:,.0f}/year: %{y:,} samples<extra></extra>",
+    ))
+    for name, color in percentile_colors.items():
+        fig.add_vline(x=result[name], line=dict(color=color, width=2, dash='dash'),
+                      annotation_text=f"{name.upper()}: ${result[name]:,.0f}",
+                      annotation_font=dict(color=color, size=12))
+
+    fig.update_layout(
+        height=400,
+        margin=dict(l=60, r=20, t=40, b=60),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        bargap=0,
+        showlegend=False,
+    )
+    fig.update_xaxes(title=dict(text="Yearly Savings ($)", font=dict(size=14)), tickprefix="$")
+    fig.update_yaxes(title=dict(text="Samples", font=dict(size=14)), showgrid=False)
+    return fig
+
+
+def simulation_histogram_png(counts, edges, result):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 4.5))
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_subplot()
+    ax.patch.set_alpha(0)
+
+    ax.stairs(counts, edges, fill=True, color='#4D96FF')
+    for name, color in percentile_colors.items():
+        ax.axvline(result[name], color=color, linestyle='--', linewidth=2,
+                   label=f"{name.upper()}: ${result[name]:,.0f}")
+
+    ax.set_xlabel("Yearly Savings ($)", fontsize=12, color='white')
+    ax.set_ylabel("Samples", fontsize=12, color='white')
+    ax.tick_params(colors='white')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['bottom'].set_color('white')
+    ax.spines['left'].set_color('white')
+    ax.legend(frameon=False, labelcolor='white')
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, **SAVEFIG_KWARGS)
+    return buf.getvalue()
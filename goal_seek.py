@@ -0,0 +1,126 @@
+import numpy as np
+
+from roi_engine import (default_tier, days_month, months_year, projected_monthly_minutes, tier_client_rates,
+                        tier_indices_for_minutes, tier_labels, tier_min_minutes, tier_rates)
+
+# —— Goal Seek ——
+# Savings per effective hour is automation_pct * (cost_per_eff_hour - ai_hourly)
+# with cost_per_eff_hour = human_hourly / efficiency, so for a fixed tier every
+# input solves in closed form. Only automation_pct under automatic tier
+# selection needs a search: the rate steps down as AI volume crosses each
+# tier's minimum, so it is solved per tier and bracketed by the tier bands.
+goal_metrics = {
+    # metric -> hours of savings_per_hour it covers for one agent (None: a percentage)
+    "savings_pct": None,
+    "savings_per_hour": lambda hours_day: 1.0,
+    "daily_savings": lambda hours_day: hours_day,
+    "monthly_savings": lambda hours_day: hours_day * days_month,
+    "yearly_savings": lambda hours_day: hours_day * days_month * months_year,
+}
+goal_inputs = ["automation_pct", "efficiency", "human_hourly"]
+
+
+def _cost_per_eff_hour_for(target, metric, hours_day, automation_pct, ai_hourly):
+    # cost_per_eff_hour at which the target is met exactly
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if goal_metrics[metric] is None:
+            return ai_hourly / (1 - target / (100 * automation_pct))
+        return target / (goal_metrics[metric](hours_day) * automation_pct) + ai_hourly
+
+
+def _automation_for(target, metric, hours_day, cost_per_eff_hour, ai_hourly):
+    # automation_pct at which the target is met exactly at a fixed rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if goal_metrics[metric] is None:
+            return target / (100 * (1 - ai_hourly / cost_per_eff_hour))
+        return target / (goal_metrics[metric](hours_day) * (cost_per_eff_hour - ai_hourly))
+
+
+def _savings(metric, hours_day, automation_pct, cost_per_eff_hour, ai_hourly):
+    savings_per_hour = automation_pct * (cost_per_eff_hour - ai_hourly)
+    if goal_metrics[metric] is None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return savings_per_hour / cost_per_eff_hour * 100
+    return savings_per_hour * goal_metrics[metric](hours_day)
+
+
+def _automation_auto_tier(target, metric, hours_day, cost_per_eff_hour, agents):
+    # Smallest automation_pct whose savings reach the target when the tier follows
+    # the projected volume. Within a tier savings grow linearly with automation and
+    # they jump up where the volume enters a cheaper tier, so the answer is either
+    # an exact root inside some tier's band or the lower edge of a band.
+    ai_hourly = tier_client_rates * 60
+    args = [a[..., None] for a in (target, hours_day, cost_per_eff_hour, agents)]
+    target, hours_day, cost_per_eff_hour, agents = args
+    minutes_per_pct = projected_monthly_minutes(hours_day, 1.0, agents)
+
+    roots = _automation_for(target, metric, hours_day, cost_per_eff_hour, ai_hourly)
+    # Rootless cells (NaN) are dropped by the range check below; -1 keeps them out of the band lookup
+    in_band = tier_indices_for_minutes(np.nan_to_num(roots * minutes_per_pct, nan=-1.0)) == np.arange(len(tier_labels))
+    roots = np.where(in_band & (roots >= 0) & (roots <= 1), roots, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        edges = np.asarray(tier_min_minutes, dtype=float) / minutes_per_pct
+    edges[..., 0] = 0.0  # volumes below Tier 1 still price at Tier 1
+    reached = _savings(metric, hours_day, edges, cost_per_eff_hour, ai_hourly) >= target
+    edges = np.where(reached & (edges <= 1), edges, np.nan)
+
+    candidates = np.concatenate([roots, edges], axis=-1)
+    found = ~np.isnan(candidates).all(axis=-1)
+    best = np.argmin(np.where(np.isnan(candidates), np.inf, candidates), axis=-1)
+    value = np.where(found, np.take_along_axis(candidates, best[..., None], axis=-1)[..., 0], np.nan)
+    return value, np.where(found, best % len(tier_labels), 0)
+
+
+def goal_seek(solve_for, target, metric="savings_pct", human_hourly=19.5, hours_day=8.0, efficiency=0.65,
+              automation_pct=0.5, tier=default_tier, agents=1):
+    # Value of solve_for ("automation_pct", "efficiency" or "human_hourly") that makes metric
+    # equal target, with the other inputs held fixed. Fractions as in calculate_roi; dollar
+    # metrics are per agent. Every argument broadcasts, so arrays of targets solve in one pass.
+    # tier="auto" follows the projected volume (agents only matter there).
+    # Returns {"value", "tier", "feasible"}; infeasible targets come back as NaN.
+    # efficiency is the highest utilization that still meets the target (at most 1.0).
+    # Break-even human_hourly is goal_seek("human_hourly", 0, "savings_per_hour").
+    if solve_for not in goal_inputs:
+        raise ValueError(f"Cannot solve for {solve_for!r}; expected one of {', '.join(goal_inputs)}")
+    if metric not in goal_metrics:
+        raise ValueError(f"Unknown goal metric: {metric!r}")
+    target, human_hourly, hours_day, efficiency, automation_pct, agents = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float)
+          for value in (target, human_hourly, hours_day, efficiency, automation_pct, agents)))
+
+    auto = isinstance(tier, str) and tier == "auto"
+    tier_index = None
+    if not auto:
+        ai_hourly = tier_rates(tier) * 60
+    elif solve_for != "automation_pct":
+        # Volume doesn't depend on utilization or pay, so the tier is known up front
+        tier_index = tier_indices_for_minutes(projected_monthly_minutes(hours_day, automation_pct, agents))
+        ai_hourly = tier_client_rates[tier_index] * 60
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if solve_for == "automation_pct":
+            cost_per_eff_hour = np.where(efficiency > 0, human_hourly / efficiency, np.nan)
+            if auto:
+                value, tier_index = _automation_auto_tier(target, metric, hours_day, cost_per_eff_hour, agents)
+            else:
+                value = _automation_for(target, metric, hours_day, cost_per_eff_hour, ai_hourly)
+            feasible = (value >= 0) & (value <= 1)
+        else:
+            cost_per_eff_hour = _cost_per_eff_hour_for(target, metric, hours_day, automation_pct, ai_hourly)
+            cost_per_eff_hour = np.where(cost_per_eff_hour > 0, cost_per_eff_hour, np.nan)
+            if solve_for == "efficiency":
+                value = human_hourly / cost_per_eff_hour
+                # Savings fall as utilization rises, so a target still met past 100%
+                # holds at every utilization up to 100%
+                value = np.where(value > 1, 1.0, value)
+                feasible = (value > 0) & (value <= 1)
+            else:
+                value = cost_per_eff_hour * efficiency
+                feasible = value >= 0
+
+    feasible &= np.isfinite(value)
+    tiers = (np.asarray(tier_labels, dtype=object)[tier_index] if auto
+             else np.broadcast_to(np.asarray(tier, dtype=object), target.shape))
+    return {"value": np.where(feasible, value, np.nan), "tier": tiers, "feasible": feasible}
+
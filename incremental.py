@@ -0,0 +1,27 @@
+import functools
+
+# —— Incremental Evaluation ——
+# Streamlit reruns app.py top to bottom on every widget change. Derived values
+# and HTML fragments go through these helpers so a rerun only rebuilds the
+# pieces whose declared inputs actually changed.
+_memoized = {}  # name -> lru_cache-wrapped function
+
+
+def memoized(maxsize=256):
+    # Process-wide memo for pure functions: the arguments are the declared inputs,
+    # so every session asking for the same inputs shares one result.
+    # Results are shared, so callers must treat them as read-only.
+    def decorator(fn):
+        cached = functools.lru_cache(maxsize=maxsize)(fn)
+        _memoized[f"{fn.__module__}.{fn.__qualname__}"] = cached
+        return cached
+    return decorator
+
+
+def memo_stats():
+    return {name: fn.cache_info()._asdict() for name, fn in _memoized.items()}
+
+
+def clear_memos():
+    for fn in _memoized.values():
+        fn.cache_clear()
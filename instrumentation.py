@@ -0,0 +1,164 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# —— Hot-path Instrumentation ——
+# Opt in with CONNEXUS_INSTRUMENT=1. When off, section() hands back one shared
+# no-op context manager, so instrumented code pays a function call and nothing else.
+ENABLED = os.environ.get("CONNEXUS_INSTRUMENT", "").lower() not in ("", "0", "false", "no")
+
+# Optional Prometheus textfile-collector target, rewritten after every instrumented run
+METRICS_FILE = os.environ.get("CONNEXUS_METRICS_FILE")
+
+_sections = {}  # name -> {"count", "total_seconds", "last_seconds", "max_seconds"}
+_lock = threading.Lock()
+_noop = nullcontext()
+
+
+def current_rss_bytes(pid="self"):
+    # pid reads another process (e.g. a launched app server); Linux only in that case
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss_bytes() if pid == "self" else None
+
+
+def peak_rss_bytes():
+    import resource
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def live_figure_count():
+    # Figures held by pyplot's global registry; 0 if pyplot was never imported
+    plt = sys.modules.get("matplotlib.pyplot")
+    return len(plt.get_fignums()) if plt is not None else 0
+
+
+def record(name, seconds):
+    with _lock:
+        stats = _sections.get(name)
+        if stats is None:
+            stats = _sections[name] = {"count": 0, "total_seconds": 0.0, "last_seconds": 0.0, "max_seconds": 0.0}
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["last_seconds"] = seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def section(name):
+    return _timed(name) if ENABLED else _noop
+
+
+def snapshot():
+    # Everything the debug panel and the exporters show
+    from assets import cache_stats
+    from charts import chart_cache_stats
+    from incremental import memo_stats
+    from scenario_store import store_stats
+
+    with _lock:
+        sections = {name: dict(stats) for name, stats in _sections.items()}
+    return {
+        "sections": sections,
+        "process": {
+            "rss_bytes": current_rss_bytes(),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "live_matplotlib_figures": live_figure_count(),
+        },
+        "caches": {"assets": cache_stats(), "charts": chart_cache_stats(), "memo": memo_stats(),
+                   "result_store": store_stats()},
+    }
+
+
+def metrics_json(snap=None):
+    return json.dumps(snap or snapshot(), indent=2)
+
+
+def metrics_prometheus(snap=None):
+    snap = snap or snapshot()
+    lines = [
+        "# HELP connexus_section_seconds_total Wall time spent in each app.py section.",
+        "# TYPE connexus_section_seconds_total counter",
+    ]
+    for name, stats in snap["sections"].items():
+        lines.append(f'connexus_section_seconds_total{{section="{name}"}} {stats["total_seconds"]:.6f}')
+    lines += ["# HELP connexus_section_runs_total Times each section ran.",
+              "# TYPE connexus_section_runs_total counter"]
+    for name, stats in snap["sections"].items():
+        lines.append(f'connexus_section_runs_total{{section="{name}"}} {stats["count"]}')
+    lines += ["# HELP connexus_section_max_seconds Slowest run of each section.",
+              "# TYPE connexus_section_max_seconds gauge"]
+    for name, stats in snap["sections"].items():
+        lines.append(f'connexus_section_max_seconds{{section="{name}"}} {stats["max_seconds"]:.6f}')
+
+    process = snap["process"]
+    lines += [
+        "# TYPE connexus_process_rss_bytes gauge",
+        f"connexus_process_rss_bytes {process['rss_bytes']}",
+        "# TYPE connexus_process_peak_rss_bytes gauge",
+        f"connexus_process_peak_rss_bytes {process['peak_rss_bytes']}",
+        "# TYPE connexus_matplotlib_live_figures gauge",
+        f"connexus_matplotlib_live_figures {process['live_matplotlib_figures']}",
+    ]
+    for cache in ("assets", "charts", "result_store"):
+        stats = snap["caches"][cache]
+        lines.append(f"# TYPE connexus_{cache}_cache_hits_total counter")
+        lines.append(f"connexus_{cache}_cache_hits_total {stats['hits']}")
+        lines.append(f"# TYPE connexus_{cache}_cache_misses_total counter")
+        lines.append(f"connexus_{cache}_cache_misses_total {stats['misses']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(snap=None):
+    # Atomic rewrite so a scraper never reads a half-written file
+    if not METRICS_FILE:
+        return
+    tmp = f"{METRICS_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(metrics_prometheus(snap))
+    os.replace(tmp, METRICS_FILE)
+
+
+def render_debug_panel(st):
+    # Sidebar panel with the latest section timings, memory and cache figures
+    snap = snapshot()
+    write_metrics_file(snap)
+    with st.sidebar.expander("🛠 Performance (debug)", expanded=False):
+        rows = [{
+            "section": name,
+            "last ms": stats["last_seconds"] * 1000,
+            "mean ms": stats["total_seconds"] / stats["count"] * 1000,
+            "max ms": stats["max_seconds"] * 1000,
+            "runs": stats["count"],
+        } for name, stats in snap["sections"].items()]
+        st.dataframe(rows, hide_index=True, width="stretch")
+
+        process = snap["process"]
+        st.write(f"RSS: {process['rss_bytes'] / 2**20:,.1f} MB (peak {process['peak_rss_bytes'] / 2**20:,.1f} MB)")
+        st.write(f"Live matplotlib figures: {process['live_matplotlib_figures']}")
+        assets, charts = snap["caches"]["assets"], snap["caches"]["charts"]
+        st.write(f"Asset cache: {assets['hits']} hits / {assets['misses']} misses")
+        st.write(f"Chart cache: {charts['hits']} hits / {charts['misses']} misses / {charts['evictions']} evictions")
+        results = snap["caches"]["result_store"]
+        st.write(f"Result store: {results['hits']} hits / {results['misses']} misses / {results['errors']} errors")
+
+        st.download_button("Metrics (JSON)", metrics_json(snap), file_name="connexus_metrics.json",
+                           mime="application/json")
+        st.download_button("Metrics (Prometheus)", metrics_prometheus(snap), file_name="connexus_metrics.prom",
+                           mime="text/plain")
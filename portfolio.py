@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from roi_engine import calculate_roi_batch, days_month, projected_monthly_minutes, tier_for_minutes
+
+# —— Multi-site Portfolio ——
+# One row per site; efficiency and automation_pct are fractions, agents is the
+# site headcount. Per-agent ROI comes from the batch engine and is scaled by agents.
+site_columns = ["site", "human_hourly", "hours_day", "efficiency", "automation_pct", "agents"]
+
+# The math is already vectorized, so a process pool only pays for its pickling
+# overhead on very large portfolios
+PARALLEL_MIN_SITES = 1_000_000
+
+
+def _price_sites(sites, tier):
+    roi = calculate_roi_batch(sites["human_hourly"].to_numpy(dtype=float),
+                              sites["hours_day"].to_numpy(dtype=float),
+                              sites["efficiency"].to_numpy(dtype=float),
+                              sites["automation_pct"].to_numpy(dtype=float),
+                              tier)
+    agents = sites["agents"].to_numpy(dtype=float)
+    hours_day = sites["hours_day"].to_numpy(dtype=float)
+    return pd.DataFrame({
+        "site": sites["site"].to_numpy(),
+        "agents": agents,
+        "monthly_ai_minutes": projected_monthly_minutes(hours_day, roi["ai_portion"], agents),
+        "cost_per_eff_hour": roi["cost_per_eff_hour"],
+        "blended_hourly_cost": roi["blended_hourly_cost"],
+        "savings_per_hour": roi["savings_per_hour"],
+        "savings_pct": roi["savings_pct"],
+        "daily_savings": roi["daily_savings"] * agents,
+        "monthly_savings": roi["monthly_savings"] * agents,
+        "yearly_savings": roi["yearly_savings"] * agents,
+        # All-human cost of the same effective hours the blended cost covers, the
+        # baseline savings are measured against: human - blended = savings
+        "monthly_human_cost": roi["cost_per_eff_hour"] * hours_day * days_month * agents,
+        "monthly_blended_cost": roi["monthly_blended_cost"] * agents,
+    }, index=sites.index)
+
+
+def evaluate_portfolio(sites, tier=None, workers=1):
+    # Returns (per-site breakdown DataFrame, portfolio totals dict).
+    # Without an explicit tier, every site prices at the tier of the pooled volume.
+    missing = [col for col in site_columns if col not in sites.columns]
+    if missing:
+        raise ValueError(f"Missing site columns: {', '.join(missing)}")
+    sites = sites[site_columns].reset_index(drop=True)
+
+    pooled_minutes = projected_monthly_minutes(sites["hours_day"].to_numpy(dtype=float),
+                                               sites["automation_pct"].to_numpy(dtype=float),
+                                               sites["agents"].to_numpy(dtype=float)).sum()
+    tier = tier or tier_for_minutes(pooled_minutes)
+
+    if workers > 1 and len(sites) >= PARALLEL_MIN_SITES:
+        bounds = np.linspace(0, len(sites), workers + 1, dtype=int)
+        parts = [sites.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            breakdown = pd.concat(pool.map(_price_sites, parts, repeat(tier)))
+    else:
+        breakdown = _price_sites(sites, tier)
+
+    human_cost = breakdown["monthly_human_cost"].sum()
+    monthly_savings = breakdown["monthly_savings"].sum()
+    totals = {
+        "sites": len(breakdown),
+        "agents": float(breakdown["agents"].sum()),
+        "tier": tier,
+        "monthly_ai_minutes": float(pooled_minutes),
+        "daily_savings": float(breakdown["daily_savings"].sum()),
+        "monthly_savings": float(monthly_savings),
+        "yearly_savings": float(breakdown["yearly_savings"].sum()),
+        "monthly_human_cost": float(human_cost),
+        "monthly_blended_cost": float(breakdown["monthly_blended_cost"].sum()),
+        "savings_pct": float(monthly_savings / human_cost * 100) if human_cost > 0 else 0.0,
+    }
+    return breakdown, totals
@@ -0,0 +1,158 @@
+"""Price a file of client scenarios without the Streamlit UI.
+
+    python price_scenarios.py scenarios.csv priced.parquet --chunk-size 100000
+
+Each input row needs human_hourly, hours_day, efficiency (or utilization) and
+automation_pct, plus either a tier label column or a monthly_minutes column
+(blank cells use the projected volume). Without either, --auto-tier resolves
+the tier from projected volume (using an optional agents column), otherwise
+--tier applies to every row. Rows are read, priced and written one chunk at a
+time, so memory stays flat regardless of file size.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from roi_engine import (ai_tier_data, default_tier, calculate_roi_batch, projected_monthly_minutes, roi_columns,
+                        tier_margins, tiers_for_minutes)
+
+input_columns = ["human_hourly", "hours_day", "efficiency", "automation_pct"]
+column_aliases = {"utilization": "efficiency", "automation": "automation_pct"}
+
+
+def file_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path!r}; pass --input-format/--output-format")
+
+
+def read_chunks(path, fmt, chunk_size):
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    else:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def price_chunk(chunk, percent=False, tier=default_tier, auto_tier=False):
+    chunk = chunk.rename(columns=column_aliases)
+    missing = [col for col in input_columns if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+    scale = 100 if percent else 1
+    efficiency = chunk["efficiency"].to_numpy(dtype=float) / scale
+    automation_pct = chunk["automation_pct"].to_numpy(dtype=float) / scale
+
+    hours_day = chunk["hours_day"].to_numpy(dtype=float)
+    agents = chunk["agents"].to_numpy(dtype=float) if "agents" in chunk.columns else 1
+    monthly_minutes = projected_monthly_minutes(hours_day, automation_pct, agents)
+    if "monthly_minutes" in chunk.columns:
+        # Blank cells fall back to the projected volume for that row
+        given = chunk["monthly_minutes"].to_numpy(dtype=float)
+        monthly_minutes = np.where(np.isnan(given), monthly_minutes, given)
+
+    if "tier" in chunk.columns:
+        tiers = chunk["tier"].to_numpy(dtype=object)
+    elif "monthly_minutes" in chunk.columns or auto_tier:
+        tiers = tiers_for_minutes(monthly_minutes)
+    else:
+        tiers = np.full(len(chunk), tier, dtype=object)
+
+    roi = calculate_roi_batch(chunk["human_hourly"].to_numpy(dtype=float), hours_day,
+                              efficiency, automation_pct, tiers)
+    margins = tier_margins(tiers, monthly_minutes)
+
+    priced = chunk.copy()
+    priced["tier"] = tiers
+    priced["monthly_ai_minutes"] = monthly_minutes
+    for col in roi_columns:
+        priced[col] = roi[col]
+    for col in ("ai_telephony", "mgmt_fee", "monthly_telephony_cost", "monthly_mgmt_fee"):
+        priced[col] = margins[col]
+    return priced
+
+
+class ChunkWriter:
+    # Appends priced chunks to a CSV or Parquet file as they are produced
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._wrote_csv_header = False
+
+    def write(self, frame):
+        if self.fmt == "csv":
+            frame.to_csv(self.path, mode="a" if self._wrote_csv_header else "w",
+                         header=not self._wrote_csv_header, index=False)
+            self._wrote_csv_header = True
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._parquet.schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def price_file(input_path, output_path, chunk_size=100_000, percent=False, tier=default_tier,
+               auto_tier=False, input_format=None, output_format=None):
+    # Streams input_path through the ROI math into output_path; returns the row count
+    writer = ChunkWriter(output_path, file_format(output_path, output_format))
+    rows = 0
+    try:
+        for chunk in read_chunks(input_path, file_format(input_path, input_format), chunk_size):
+            writer.write(price_chunk(chunk, percent=percent, tier=tier, auto_tier=auto_tier))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-price client scenarios with the ConnexUS ROI math.")
+    parser.add_argument("input", help="CSV or Parquet file of scenarios")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per chunk (default: 100000)")
+    parser.add_argument("--percent", action="store_true",
+                        help="efficiency and automation_pct are 0-100 like the sliders, not fractions")
+    parser.add_argument("--tier", default=default_tier, choices=list(ai_tier_data),
+                        help="tier for files without a tier or monthly_minutes column")
+    parser.add_argument("--auto-tier", action="store_true",
+                        help="resolve each row's tier from hours_day x automation_pct x agents volume")
+    parser.add_argument("--input-format", choices=["csv", "parquet"])
+    parser.add_argument("--output-format", choices=["csv", "parquet"])
+    args = parser.parse_args(argv)
+
+    try:
+        rows = price_file(args.input, args.output, chunk_size=args.chunk_size, percent=args.percent,
+                          tier=args.tier, auto_tier=args.auto_tier,
+                          input_format=args.input_format, output_format=args.output_format)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Priced {rows:,} scenarios -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
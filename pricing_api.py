@@ -0,0 +1,193 @@
+"""Headless JSON pricing API, separate from the Streamlit UI.
+
+    python pricing_api.py --port 8600
+
+POST /quote with the sidebar inputs (utilization and automation in %, like the
+sliders):
+
+    {"human_hourly": 19.5, "hours_day": 8, "efficiency": 65, "automation_pct": 50,
+     "tier": "Tier 3 (10,000-24,999 min) - $0.18"}
+
+"tier" may also be "auto" (resolved from projected volume, with an optional
+"agents" count) and defaults to the app's default tier. Any input may be a list
+to price a batch in one request; scalars are broadcast. GET /tiers lists the
+tier labels and GET /health is a liveness probe.
+"""
+import argparse
+import json
+import sys
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from roi_engine import (ai_tier_data, default_tier, calculate_roi, calculate_roi_batch, projected_monthly_minutes,
+                        tier_for_minutes, tiers_for_minutes)
+
+QUOTE_CACHE_SIZE = 4096
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+quote_fields = ["human_hourly", "hours_day", "efficiency", "automation_pct"]
+percent_fields = ["efficiency", "automation_pct"]
+
+
+def check_inputs(columns, agents):
+    # JSON bodies can carry NaN, Infinity and negatives; reject them up front rather
+    # than quote nonsense or emit non-standard JSON
+    for field, value in [*columns.items(), ("agents", agents)]:
+        value = np.asarray(value, dtype=float)
+        if not np.isfinite(value).all():
+            raise ValueError(f"{field} must be a finite number")
+        if (value < 0).any():
+            raise ValueError(f"{field} must not be negative")
+        if field in percent_fields and (value > 100).any():
+            raise ValueError(f"{field} must be a percentage between 0 and 100")
+
+
+def quote_response(roi, tier):
+    # Same figures the Breakdown Table, Savings Summary and projection cards show
+    return {
+        "tier": tier,
+        "breakdown": {
+            "cost_per_minute": {"human": roi["human_cost_per_minute"], "ai": roi["ai_cost_per_minute"]},
+            "hourly_rate": {"human": roi["human_cost_per_minute"] * 60, "ai": roi["ai_hourly"]},
+            "cost_per_day": {"human": roi["cost_day"], "ai": roi["ai_cost_day"]},
+            "effective_hours_worked": {"human": roi["worked_hours"]},
+            "cost_per_effective_hour": {"human": roi["cost_per_eff_hour"], "ai": roi["ai_hourly"],
+                                        "blended": roi["blended_hourly_cost"]},
+        },
+        "savings": {"per_hour": roi["savings_per_hour"], "pct": roi["savings_pct"]},
+        "projections": {
+            "daily_savings": roi["daily_savings"],
+            "monthly_savings": roi["monthly_savings"],
+            "yearly_savings": roi["yearly_savings"],
+            "monthly_human_cost": roi["monthly_human_cost"],
+            "monthly_blended_cost": roi["monthly_blended_cost"],
+            "yearly_human_cost": roi["yearly_human_cost"],
+            "yearly_blended_cost": roi["yearly_blended_cost"],
+        },
+    }
+
+
+@lru_cache(maxsize=QUOTE_CACHE_SIZE)
+def quote_json(human_hourly, hours_day, efficiency, automation_pct, tier, agents=1):
+    # Encoded response for one input tuple; repeat quotes skip both the math and json.dumps
+    if tier == "auto":
+        tier = tier_for_minutes(projected_monthly_minutes(hours_day, automation_pct / 100, agents))
+    if tier not in ai_tier_data:
+        raise ValueError(f"Unknown AI tier: {tier!r}")
+    roi = calculate_roi(human_hourly, hours_day, efficiency / 100, automation_pct / 100, tier)
+    return json.dumps(quote_response(roi, tier), allow_nan=False).encode()
+
+
+def batch_quote_json(payload):
+    # Lists are priced in one vectorized pass; every list must have the same length
+    columns = {field: np.asarray(payload[field], dtype=float) for field in quote_fields}
+    tier = payload.get("tier", default_tier)
+    agents = np.asarray(payload.get("agents", 1), dtype=float)
+    check_inputs(columns, agents)
+    n = max(np.size(value) for value in [*columns.values(), np.asarray(tier, dtype=object), agents])
+    columns = {field: np.broadcast_to(value, n) for field, value in columns.items()}
+
+    tiers = np.broadcast_to(np.asarray(tier, dtype=object), n)
+    # Same rule as quote_json: labels or "auto" only, never a raw per-minute rate
+    for label in tiers:
+        if not isinstance(label, str) or (label != "auto" and label not in ai_tier_data):
+            raise ValueError(f"Unknown AI tier: {label!r}")
+    auto = tiers == "auto"
+    if auto.any():
+        minutes = projected_monthly_minutes(columns["hours_day"], columns["automation_pct"] / 100, agents)
+        tiers = np.where(auto, tiers_for_minutes(np.broadcast_to(minutes, n)), tiers)
+
+    roi = calculate_roi_batch(columns["human_hourly"], columns["hours_day"],
+                              columns["efficiency"] / 100, columns["automation_pct"] / 100, tiers)
+    rows = [quote_response({key: value[i].item() for key, value in roi.items()}, tiers[i]) for i in range(n)]
+    return json.dumps({"quotes": rows}, allow_nan=False).encode()
+
+
+def handle_quote(payload):
+    missing = [field for field in quote_fields if field not in payload]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    if any(isinstance(payload.get(field), list) for field in [*quote_fields, "tier", "agents"]):
+        return batch_quote_json(payload)
+    columns = {field: float(payload[field]) for field in quote_fields}
+    agents = float(payload.get("agents", 1))
+    check_inputs(columns, agents)
+    return quote_json(*columns.values(), payload.get("tier", default_tier), agents)
+
+
+class PricingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so partners can reuse connections
+    # Headers and body go out as separate writes; without TCP_NODELAY every
+    # response waits on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, b'{"status": "ok"}')
+        elif self.path == "/tiers":
+            self._send(200, json.dumps({"default": default_tier, "tiers": ai_tier_data}).encode())
+        else:
+            self._error(404, "Not found")
+
+    def do_POST(self):
+        if self.path != "/quote":
+            self._error(404, "Not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            # The body wasn't read, so the connection can't be reused
+            self.close_connection = True
+            if length < 0:
+                self._error(400, "Invalid Content-Length")
+            else:
+                self._error(413, "Request body too large")
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            body = handle_quote(payload)
+        except (TypeError, ValueError) as e:
+            self._error(400, str(e))
+            return
+        self._send(200, body)
+
+    def log_message(self, format, *args):
+        # Per-request access logging costs more than a cached quote
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve ConnexUS ROI quotes as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), PricingHandler)
+    print(f"Pricing API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
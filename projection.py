@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from roi_engine import (calculate_roi_batch, days_month, months_year, projected_monthly_minutes, tier_client_rates,
+                        tier_indices_for_minutes, tier_labels, tier_rates)
+
+# —— Multi-year Projection ——
+# Month-by-month costs and savings over a 1-5 year horizon. Scenarios run along
+# the leading axes and months along the last one, so a whole horizon for every
+# scenario is a single batch pass through calculate_roi_batch.
+MAX_HORIZON_YEARS = 5
+
+
+def working_days(start, months, holidays=()):
+    # Mon-Fri working days in each calendar month, starting at start ("2026-01", a date, ...)
+    first = np.datetime64(start, "M") + np.arange(months)
+    return np.busday_count(first.astype("datetime64[D]"), (first + 1).astype("datetime64[D]"),
+                           holidays=list(holidays)).astype(float)
+
+
+def automation_ramp(target, months, ramp_months=0, start=0.0):
+    # Linear ramp from start to target over the first ramp_months, then flat.
+    # target and start may be per-scenario arrays; months become the last axis.
+    target = np.asarray(target, dtype=float)[..., None]
+    start = np.asarray(start, dtype=float)[..., None]
+    if ramp_months > 0:
+        progress = np.minimum(np.arange(1, months + 1) / ramp_months, 1.0)
+    else:
+        progress = np.ones(months)
+    return start + (target - start) * progress
+
+
+def project(human_hourly, hours_day, efficiency, automation, tier="auto", agents=1, years=1,
+            calendar=None, setup_cost=0.0):
+    # automation broadcasts against (scenarios..., months): a scalar is flat, automation_ramp() ramps.
+    # calendar is the working days of each month (defaults to days_month for every month).
+    # tier="auto" re-resolves the tier every month from that month's AI volume;
+    # otherwise it is a label or rate, optionally one per scenario.
+    # payback_month is the first month (1-based) whose cumulative savings cover
+    # setup_cost, or 0 if that doesn't happen within the horizon.
+    if not 1 <= years <= MAX_HORIZON_YEARS:
+        raise ValueError(f"Horizon must be 1-{MAX_HORIZON_YEARS} years, got {years}")
+    months = years * months_year
+    days = np.broadcast_to(np.asarray(days_month if calendar is None else calendar, dtype=float), (months,))
+
+    # Per-scenario inputs gain a trailing month axis
+    human_hourly, hours_day, efficiency, agents, setup_cost = (
+        np.asarray(value, dtype=float)[..., None]
+        for value in (human_hourly, hours_day, efficiency, agents, setup_cost))
+    automation = np.asarray(automation, dtype=float)
+
+    monthly_ai_minutes = projected_monthly_minutes(hours_day, automation, agents, days)
+    if isinstance(tier, str) and tier == "auto":
+        tier_index = tier_indices_for_minutes(monthly_ai_minutes)
+        rate = tier_client_rates[tier_index]
+    else:
+        tier_index = None
+        rate = tier_rates(tier)[..., None]
+
+    roi = calculate_roi_batch(human_hourly, hours_day, efficiency, automation, rate)
+    # All-human cost of the same effective hours, so human_cost - blended_cost == savings
+    human_cost = roi["cost_per_eff_hour"] * hours_day * days * agents
+    blended_cost = roi["blended_hourly_cost"] * hours_day * days * agents
+    savings = roi["daily_savings"] * days * agents
+    cumulative_savings = np.cumsum(savings, axis=-1)
+
+    paid_back = cumulative_savings >= setup_cost
+    payback_month = np.where(paid_back.any(axis=-1), paid_back.argmax(axis=-1) + 1, 0)
+    return {
+        "month": np.arange(1, months + 1),
+        "days": days,
+        "automation_pct": roi["ai_portion"],
+        "monthly_ai_minutes": np.broadcast_to(monthly_ai_minutes, savings.shape),
+        "cumulative_ai_minutes": np.cumsum(np.broadcast_to(monthly_ai_minutes, savings.shape), axis=-1),
+        "tier_index": tier_index,
+        "ai_cost_per_minute": roi["ai_cost_per_minute"],
+        "human_cost": human_cost,
+        "blended_cost": blended_cost,
+        "savings": savings,
+        "cumulative_savings": cumulative_savings,
+        "setup_cost": setup_cost[..., 0],
+        "payback_month": payback_month,
+    }
+
+
+def yearly_totals(result):
+    # Costs and savings summed per projection year; arrays end in a years axis
+    months = result["month"].size
+    return {
+        column: result[column].reshape(*result[column].shape[:-1], months // months_year, months_year).sum(axis=-1)
+        for column in ("human_cost", "blended_cost", "savings")
+    }
+
+
+def projection_frame(result, scenario=()):
+    # One scenario's monthly series as a DataFrame; scenario indexes the leading axes
+    columns = ["automation_pct", "monthly_ai_minutes", "cumulative_ai_minutes", "ai_cost_per_minute",
+               "human_cost", "blended_cost", "savings", "cumulative_savings"]
+    frame = pd.DataFrame({"month": result["month"], "days": result["days"]})
+    if result["tier_index"] is not None:
+        frame["tier"] = np.asarray(tier_labels, dtype=object)[result["tier_index"][scenario]]
+    for column in columns:
+        frame[column] = np.broadcast_to(result[column], result["savings"].shape)[scenario]
+    return frame
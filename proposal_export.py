@@ -0,0 +1,321 @@
+import os
+import re
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+
+from charts import comparison_chart_png
+from roi_engine import default_tier, projected_monthly_minutes, tier_for_minutes, tier_rate
+from scenario_store import result_key
+from views import roi_for
+
+# —— Proposal Export ——
+# Branded one-page proposals built from the same figures and chart the app shows.
+# Rendering runs in a small process pool behind a job queue, so an export never
+# holds up the session that asked for it or anyone else's. Chart PNGs come from
+# the chart cache and the on-disk result store, so bulk jobs reuse earlier renders.
+EXPORT_FORMATS = {
+    "pdf": "application/pdf",
+    "png": "image/png",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_WORKERS = int(os.environ.get("CONNEXUS_EXPORT_WORKERS", "2"))
+SCENARIOS_PER_TASK = 25  # bulk jobs are split so progress moves and workers share the load
+JOB_TTL_SECONDS = 3600
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "connexus_logo.png")
+LOGO_WIDTH = 800
+PAGE_SIZE = (8.5, 11)
+PNG_DPI = 150
+accent_color = "#FF6700"
+chart_background = "#0E1117"  # the chart is drawn for the app's dark theme
+
+
+def proposal_scenario(human_hourly, hours_day, efficiency, automation_pct, tier=default_tier, agents=1, name=""):
+    # efficiency and automation_pct are fractions; tier="auto" follows the projected volume
+    if tier == "auto":
+        tier = tier_for_minutes(projected_monthly_minutes(hours_day, automation_pct, agents))
+    tier_rate(tier)  # unknown or blank tiers fail here, before a job is queued
+    return {"human_hourly": float(human_hourly), "hours_day": float(hours_day), "efficiency": float(efficiency),
+            "automation_pct": float(automation_pct), "tier": tier, "agents": int(agents), "name": str(name)}
+
+
+def scenarios_from_frame(frame):
+    # Bulk export input: portfolio-style columns with efficiency and automation_pct in %,
+    # plus optional tier, agents and name (or site)
+    frame = frame.rename(columns={"site": "name"})
+    # Blank optional cells get the same defaults as a missing column; blank inputs are an error
+    frame = frame.fillna({"tier": default_tier, "agents": 1, "name": ""})
+    blank = frame[["human_hourly", "hours_day", "efficiency", "automation_pct"]].isna().any(axis=1).to_numpy()
+    if blank.any():
+        rows = [str(i + 1) for i in blank.nonzero()[0][:10]]
+        raise ValueError(f"Blank human_hourly, hours_day, efficiency or automation_pct in row(s) {', '.join(rows)}")
+    return [proposal_scenario(row["human_hourly"], row["hours_day"], row["efficiency"] / 100,
+                              row["automation_pct"] / 100, row.get("tier", default_tier), row.get("agents", 1),
+                              row.get("name", ""))
+            for row in frame.to_dict("records")]
+
+
+def proposal_filename(scenario, fmt):
+    # Named after the inputs, so the same proposal always gets the same filename
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", scenario["name"]).strip("_") or "scenario"
+    inputs = [scenario["human_hourly"], scenario["hours_day"], scenario["efficiency"], scenario["automation_pct"],
+              scenario["tier"], scenario["agents"]]
+    return f"connexus_proposal_{slug}_{result_key('proposal', inputs)[:8]}.{fmt}"
+
+
+@lru_cache(maxsize=1)
+def _logo_png():
+    # Downscaled once per process; the original is far wider than any page needs
+    from PIL import Image
+
+    with Image.open(LOGO_PATH) as img:
+        img.thumbnail((LOGO_WIDTH, LOGO_WIDTH))
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def proposal_content(scenario):
+    s = scenario
+    roi = roi_for(s["human_hourly"], s["hours_day"], s["efficiency"], s["automation_pct"], s["tier"])
+    breakdown = [
+        ("Cost per minute", f"${s['human_hourly'] / 60:.2f}", f"${roi['ai_cost_per_minute']:.2f}"),
+        ("Hourly Rate", f"${s['human_hourly']:.2f}", f"${roi['ai_hourly']:.2f}"),
+        ("Working hours per day", f"{s['hours_day']:g}", f"{s['hours_day']:g}"),
+        ("Utilization", f"{s['efficiency'] * 100:.0f}%", "100%"),
+        ("Cost per day", f"${roi['cost_day']:.2f}", f"${roi['ai_cost_day']:.2f}"),
+        ("Effective hours worked", f"{roi['worked_hours']:.2f}", f"{s['hours_day']:g}"),
+        ("Cost per effective hour", f"${roi['cost_per_eff_hour']:.2f}", f"${roi['ai_hourly']:.2f}"),
+    ]
+    projections = [
+        ("Daily", roi["daily_savings"]),
+        ("Monthly", roi["monthly_savings"]),
+        ("Yearly", roi["yearly_savings"]),
+    ]
+    return {
+        "title": s["name"] or "AI vs Human ROI Proposal",
+        "subtitle": (f"{s['tier']} · {s['agents']} agent{'s' if s['agents'] != 1 else ''} · "
+                     f"{s['automation_pct'] * 100:.0f}% AI automation · {date.today():%B %d, %Y}"),
+        "breakdown": breakdown,
+        "savings": (f"Saving per Hour: ${roi['savings_per_hour']:.2f}", f"Saving Percentage: {roi['savings_pct']:.1f}%"),
+        "projections": projections,
+        "team_yearly": roi["yearly_savings"] * s["agents"],
+        "agents": s["agents"],
+        "chart_png": comparison_chart_png(roi["cost_per_eff_hour"], roi["blended_hourly_cost"], roi["human_portion"]),
+    }
+
+
+# —— Renderers ——
+def _rule(fig, y):
+    from matplotlib.lines import Line2D
+
+    return Line2D([0.08, 0.92], [y, y], transform=fig.transFigure, color=accent_color, linewidth=2)
+
+
+def render_page(scenario, fmt="pdf"):
+    # One letter-size page drawn with matplotlib's OO API (no pyplot state), as PDF or PNG
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+
+    content = proposal_content(scenario)
+    fig = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(fig)
+
+    logo_ax = fig.add_axes([0.08, 0.90, 0.42, 0.06])
+    logo_ax.imshow(imread(BytesIO(_logo_png())))
+    logo_ax.set_axis_off()
+    fig.text(0.08, 0.86, content["title"], fontsize=20, fontweight="bold", color="#222222")
+    fig.text(0.08, 0.835, content["subtitle"], fontsize=9, color="#555555")
+    fig.add_artist(_rule(fig, 0.825))
+
+    table_ax = fig.add_axes([0.08, 0.57, 0.84, 0.24])
+    table_ax.set_axis_off()
+    table = table_ax.table(cellText=content["breakdown"], colLabels=["", "Human", "AI"],
+                           colWidths=[0.44, 0.28, 0.28], cellLoc="center", bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    for (row, col), cell in table.get_celld().items():
+        cell.set_edgecolor("#CCCCCC")
+        if col == 0:
+            cell.set_text_props(ha="left")
+            cell.PAD = 0.03
+        if row == 0 or row == len(content["breakdown"]):
+            cell.set_text_props(fontweight="bold")
+
+    chart_ax = fig.add_axes([0.2, 0.23, 0.6, 0.32])
+    chart_ax.set_facecolor(chart_background)
+    chart_ax.imshow(imread(BytesIO(content["chart_png"])))
+    chart_ax.set_xticks([])
+    chart_ax.set_yticks([])
+
+    fig.text(0.08, 0.185, content["savings"][0], fontsize=13, fontweight="bold", color="#1E4620")
+    fig.text(0.55, 0.185, content["savings"][1], fontsize=13, fontweight="bold", color="#1E4620")
+    for i, (label, value) in enumerate(content["projections"]):
+        fig.text(0.08 + i * 0.29, 0.11, f"{label}\n${value:,.2f}", fontsize=12, ha="left", va="center",
+                 bbox=dict(boxstyle="round,pad=0.6", fc="#EAF1FB", ec="#2A3E68"))
+    footnote = "Savings per agent."
+    if content["agents"] > 1:
+        footnote += f" Yearly savings for all {content['agents']} agents: ${content['team_yearly']:,.2f}."
+    fig.text(0.08, 0.045, footnote, fontsize=9, color="#555555")
+
+    buf = BytesIO()
+    fig.savefig(buf, format=fmt, dpi=PNG_DPI)
+    return buf.getvalue()
+
+
+def render_xlsx(scenario):
+    from openpyxl import Workbook
+    from openpyxl.drawing.image import Image as SheetImage
+    from openpyxl.styles import Font
+
+    content = proposal_content(scenario)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Proposal"
+    ws.column_dimensions["A"].width = 28
+    ws.column_dimensions["B"].width = 14
+    ws.column_dimensions["C"].width = 14
+
+    logo = SheetImage(BytesIO(_logo_png()))
+    logo.width, logo.height = logo.width * 0.4, logo.height * 0.4
+    ws.add_image(logo, "A1")
+    ws["A5"] = content["title"]
+    ws["A5"].font = Font(bold=True, size=16)
+    ws["A6"] = content["subtitle"]
+
+    ws.append([])
+    ws.append(["Breakdown", "Human", "AI"])
+    header_row = ws.max_row
+    for row in content["breakdown"]:
+        ws.append(list(row))
+    for cell in ws[header_row]:
+        cell.font = Font(bold=True)
+
+    ws.append([])
+    for line in content["savings"]:
+        ws.append([line])
+        ws.cell(ws.max_row, 1).font = Font(bold=True)
+    ws.append([])
+    ws.append(["Savings per agent", "Amount"])
+    ws.cell(ws.max_row, 1).font = ws.cell(ws.max_row, 2).font = Font(bold=True)
+    for label, value in content["projections"]:
+        ws.append([label, value])
+        ws.cell(ws.max_row, 2).number_format = '"$"#,##0.00'
+    if content["agents"] > 1:
+        ws.append([f"Yearly, all {content['agents']} agents", content["team_yearly"]])
+        ws.cell(ws.max_row, 2).number_format = '"$"#,##0.00'
+
+    chart = SheetImage(BytesIO(content["chart_png"]))
+    chart.width, chart.height = chart.width * 0.25, chart.height * 0.25
+    ws.add_image(chart, "E5")
+
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def render_proposal(scenario, fmt="pdf"):
+    data = render_xlsx(scenario) if fmt == "xlsx" else render_page(scenario, fmt)
+    return proposal_filename(scenario, fmt), data
+
+
+def render_batch(scenarios, fmt):
+    # Worker task: one slice of a job
+    return [render_proposal(scenario, fmt) for scenario in scenarios]
+
+
+# —— Job Queue ——
+class ExportQueue:
+    def __init__(self, workers=EXPORT_WORKERS):
+        # Default (fork) context, like the simulation and portfolio pools. spawn would
+        # re-run sys.modules["__main__"] in every worker, which under Streamlit is app.py.
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, scenarios, fmt="pdf"):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt!r}")
+        scenarios = list(scenarios)
+        if not scenarios:
+            raise ValueError("Nothing to export")
+        futures = [self._pool.submit(render_batch, scenarios[i:i + SCENARIOS_PER_TASK], fmt)
+                   for i in range(0, len(scenarios), SCENARIOS_PER_TASK)]
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {"format": fmt, "futures": futures, "scenarios": len(scenarios),
+                                  "created": time.time(), "result": None}
+        return job_id
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items() if job["created"] < cutoff]:
+            for future in self._jobs.pop(job_id)["futures"]:
+                future.cancel()
+
+    def status(self, job_id):
+        # None for unknown or expired jobs
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        futures = job["futures"]
+        done = [future for future in futures if future.done()]
+        error = next((future.exception() for future in done if not future.cancelled() and future.exception()), None)
+        if error is not None:
+            state = "failed"
+        elif len(done) == len(futures):
+            state = "done"
+        elif done or any(future.running() for future in futures):
+            state = "running"
+        else:
+            state = "queued"
+        return {"state": state, "progress": len(done) / len(futures), "scenarios": job["scenarios"],
+                "format": job["format"], "error": str(error) if error is not None else None}
+
+    def result(self, job_id):
+        # (filename, mime type, bytes) of a finished job; several reports come back as one zip
+        with self._lock:
+            job = self._jobs[job_id]
+        if job["result"] is None:
+            files = [file for future in job["futures"] for file in future.result()]
+            if len(files) == 1:
+                name, data = files[0]
+                job["result"] = (name, EXPORT_FORMATS[job["format"]], data)
+            else:
+                buf = BytesIO()
+                names = set()
+                with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+                    for row, (name, data) in enumerate(files, start=1):
+                        # Repeated rows would share a name and overwrite each other when unzipped
+                        if name in names:
+                            stem, ext = os.path.splitext(name)
+                            name = f"{stem}_{row}{ext}"
+                        names.add(name)
+                        archive.writestr(name, data)
+                job["result"] = (f"connexus_proposals_{job_id[:8]}.zip", "application/zip", buf.getvalue())
+        return job["result"]
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def export_queue():
+    # Process-wide queue, started on first use
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportQueue()
+        return _queue
@@ -0,0 +1,274 @@
+from bisect import bisect_right
+
+import numpy as np
+
+# —— Pricing Tiers ——
+ai_tier_data = {
+    "Tier 1 (1,000-4,999 min) - $0.25": {"client_rate": 0.25, "ai_telephony": 0.20, "mgmt_fee": 0.05, "min_minutes": 1000},
+    "Tier 2 (5,000-9,999 min) - $0.22": {"client_rate": 0.22, "ai_telephony": 0.18, "mgmt_fee": 0.04, "min_minutes": 5000},
+    "Tier 3 (10,000-24,999 min) - $0.18": {"client_rate": 0.18, "ai_telephony": 0.15, "mgmt_fee": 0.03, "min_minutes": 10000},
+    "Tier 4 (25,000-49,999 min) - $0.16": {"client_rate": 0.16, "ai_telephony": 0.14, "mgmt_fee": 0.02, "min_minutes": 25000},
+    "Tier 5 (≥50,000 min) - $0.14": {"client_rate": 0.14, "ai_telephony": 0.12, "mgmt_fee": 0.02, "min_minutes": 50000}
+}
+_client_rates = {label: pricing["client_rate"] for label, pricing in ai_tier_data.items()}
+default_tier = "Tier 3 (10,000-24,999 min) - $0.18"
+
+# Projection calendar
+days_month = 22  # Average working days per month
+months_year = 12
+
+# Every metric the app displays, in the order the batch API returns them
+roi_columns = [
+    "human_cost_per_minute",
+    "ai_cost_per_minute",
+    "ai_hourly",
+    "cost_day",
+    "ai_cost_day",
+    "worked_hours",
+    "human_portion",
+    "ai_portion",
+    "cost_per_eff_hour",
+    "blended_hourly_cost",
+    "savings_per_hour",
+    "savings_pct",
+    "daily_savings",
+    "monthly_human_cost",
+    "monthly_blended_cost",
+    "monthly_savings",
+    "yearly_human_cost",
+    "yearly_blended_cost",
+    "yearly_savings",
+]
+
+
+def tier_rate(tier):
+    # A tier is either an ai_tier_data label or a positive client rate per minute.
+    # Blank cells (NaN) and other non-finite rates are rejected rather than priced.
+    if isinstance(tier, str):
+        try:
+            return _client_rates[tier]
+        except KeyError:
+            raise ValueError(f"Unknown AI tier: {tier!r}") from None
+    try:
+        rate = float(tier)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown AI tier: {tier!r}") from None
+    if not (np.isfinite(rate) and rate > 0):
+        raise ValueError(f"AI rate per minute must be a positive number, got {tier!r}")
+    return rate
+
+
+def tier_rates(tiers):
+    # Vectorized tier_rate. Labels go through a dict lookup rather than np.unique,
+    # which would sort every string in the batch.
+    tiers = np.asarray(tiers)
+    if tiers.dtype.kind not in "USO":
+        rates = tiers.astype(float)
+        if not (np.isfinite(rates) & (rates > 0)).all():
+            raise ValueError("AI rates per minute must be positive numbers")
+        return rates
+    rates = np.fromiter(map(tier_rate, tiers.ravel()), dtype=float, count=tiers.size)
+    return rates.reshape(tiers.shape)
+
+
+# —— Volume-based Tier Resolution ——
+# Sorted breakpoint index built once from ai_tier_data: tier i covers
+# [tier_min_minutes[i], tier_min_minutes[i + 1]) monthly AI minutes.
+tier_labels = sorted(ai_tier_data, key=lambda label: ai_tier_data[label]["min_minutes"])
+tier_min_minutes = [ai_tier_data[label]["min_minutes"] for label in tier_labels]
+tier_client_rates = np.array([_client_rates[label] for label in tier_labels], dtype=float)
+_tier_label_array = np.array(tier_labels, dtype=object)
+_tier_min_array = np.array(tier_min_minutes, dtype=float)
+_tier_positions = {label: index for index, label in enumerate(tier_labels)}
+_tier_telephony = np.array([ai_tier_data[label]["ai_telephony"] for label in tier_labels], dtype=float)
+_tier_mgmt_fees = np.array([ai_tier_data[label]["mgmt_fee"] for label in tier_labels], dtype=float)
+
+
+def projected_monthly_minutes(hours_day, automation_pct, agents=1, days=days_month):
+    # AI-handled minutes per month; works on scalars and arrays alike
+    return hours_day * automation_pct * 60 * days * agents
+
+
+def tier_for_minutes(monthly_minutes):
+    # Volumes below Tier 1 still price at Tier 1; a missing (NaN) volume has no tier
+    if monthly_minutes != monthly_minutes:
+        raise ValueError("Monthly AI minutes are missing (NaN); cannot pick a tier")
+    index = bisect_right(tier_min_minutes, monthly_minutes) - 1
+    return tier_labels[max(index, 0)]
+
+
+def tier_indices_for_minutes(monthly_minutes):
+    # Positions in tier_labels / tier_client_rates; lets callers price by rate without label strings
+    monthly_minutes = np.asarray(monthly_minutes, dtype=float)
+    if np.isnan(monthly_minutes).any():
+        raise ValueError("Monthly AI minutes are missing (NaN); cannot pick a tier")
+    index = np.searchsorted(_tier_min_array, monthly_minutes, side="right") - 1
+    return np.clip(index, 0, len(tier_labels) - 1)
+
+
+def tiers_for_minutes(monthly_minutes):
+    # Vectorized tier_for_minutes
+    return _tier_label_array[tier_indices_for_minutes(monthly_minutes)]
+
+
+def tier_margin(tier, monthly_minutes=0):
+    # Split of the client rate into AI telephony cost and management fee,
+    # per minute and for the given monthly volume
+    try:
+        pricing = ai_tier_data[tier]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown AI tier: {tier!r}") from None
+    return {
+        "tier": tier,
+        "client_rate": pricing["client_rate"],
+        "ai_telephony": pricing["ai_telephony"],
+        "mgmt_fee": pricing["mgmt_fee"],
+        "margin_pct": pricing["mgmt_fee"] / pricing["client_rate"] * 100,
+        "monthly_minutes": monthly_minutes,
+        "monthly_revenue": pricing["client_rate"] * monthly_minutes,
+        "monthly_telephony_cost": pricing["ai_telephony"] * monthly_minutes,
+        "monthly_mgmt_fee": pricing["mgmt_fee"] * monthly_minutes,
+    }
+
+
+def _tier_position(tier):
+    try:
+        return _tier_positions[tier]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown AI tier: {tier!r}") from None
+
+
+def tier_margins(tiers, monthly_minutes=0):
+    # Vectorized tier_margin over arrays of tier labels and volumes; returns {column: ndarray}.
+    # Labels map to tier positions through a dict, as in tier_rates.
+    tiers = np.asarray(tiers, dtype=object)
+    index = np.fromiter(map(_tier_position, tiers.ravel()), dtype=np.intp, count=tiers.size).reshape(tiers.shape)
+    monthly_minutes = np.asarray(monthly_minutes, dtype=float)
+
+    client_rate = tier_client_rates[index]
+    ai_telephony = _tier_telephony[index]
+    mgmt_fee = _tier_mgmt_fees[index]
+    return {
+        "client_rate": client_rate,
+        "ai_telephony": ai_telephony,
+        "mgmt_fee": mgmt_fee,
+        "margin_pct": mgmt_fee / client_rate * 100,
+        "monthly_revenue": client_rate * monthly_minutes,
+        "monthly_telephony_cost": ai_telephony * monthly_minutes,
+        "monthly_mgmt_fee": mgmt_fee * monthly_minutes,
+    }
+
+
+def calculate_roi(human_hourly, hours_day, efficiency, automation_pct, tier=default_tier):
+    # Scalar ROI for a single set of sidebar inputs (efficiency and automation_pct are fractions)
+    ai_cost_per_minute = tier_rate(tier)
+    ai_hourly = ai_cost_per_minute * 60
+    cost_day = human_hourly * hours_day
+    worked_hours = hours_day * efficiency
+
+    human_portion = 1 - automation_pct
+    ai_portion = automation_pct
+
+    cost_per_eff_hour = cost_day / worked_hours if worked_hours > 0 else 0
+    blended_hourly_cost = (human_portion * cost_per_eff_hour) + (ai_portion * ai_hourly)
+
+    savings_per_hour = cost_per_eff_hour - blended_hourly_cost
+    savings_pct = (savings_per_hour / cost_per_eff_hour * 100) if cost_per_eff_hour > 0 else 0
+
+    daily_savings = savings_per_hour * hours_day
+    monthly_human_cost = cost_day * days_month
+    monthly_blended_cost = blended_hourly_cost * hours_day * days_month
+    monthly_savings = daily_savings * days_month
+
+    return {
+        "human_cost_per_minute": human_hourly / 60,
+        "ai_cost_per_minute": ai_cost_per_minute,
+        "ai_hourly": ai_hourly,
+        "cost_day": cost_day,
+        "ai_cost_day": ai_hourly * hours_day,
+        "worked_hours": worked_hours,
+        "human_portion": human_portion,
+        "ai_portion": ai_portion,
+        "cost_per_eff_hour": cost_per_eff_hour,
+        "blended_hourly_cost": blended_hourly_cost,
+        "savings_per_hour": savings_per_hour,
+        "savings_pct": savings_pct,
+        "daily_savings": daily_savings,
+        "monthly_human_cost": monthly_human_cost,
+        "monthly_blended_cost": monthly_blended_cost,
+        "monthly_savings": monthly_savings,
+        "yearly_human_cost": monthly_human_cost * months_year,
+        "yearly_blended_cost": monthly_blended_cost * months_year,
+        "yearly_savings": monthly_savings * months_year,
+    }
+
+
+def calculate_roi_batch(human_hourly, hours_day, efficiency, automation_pct, tier=default_tier):
+    # Same math as calculate_roi over broadcastable arrays; returns {column: ndarray}
+    human_hourly, hours_day, efficiency, automation_pct, ai_cost_per_minute = np.broadcast_arrays(
+        np.asarray(human_hourly, dtype=float),
+        np.asarray(hours_day, dtype=float),
+        np.asarray(efficiency, dtype=float),
+        np.asarray(automation_pct, dtype=float),
+        tier_rates(tier),
+    )
+
+    ai_hourly = ai_cost_per_minute * 60
+    cost_day = human_hourly * hours_day
+    worked_hours = hours_day * efficiency
+
+    human_portion = 1 - automation_pct
+    ai_portion = automation_pct
+
+    # worked_hours == 0 and cost_per_eff_hour == 0 fall back to 0, as in the scalar path
+    cost_per_eff_hour = np.divide(cost_day, worked_hours, out=np.zeros_like(cost_day), where=worked_hours > 0)
+    blended_hourly_cost = (human_portion * cost_per_eff_hour) + (ai_portion * ai_hourly)
+
+    savings_per_hour = cost_per_eff_hour - blended_hourly_cost
+    savings_pct = np.divide(savings_per_hour, cost_per_eff_hour,
+                            out=np.zeros_like(savings_per_hour), where=cost_per_eff_hour > 0) * 100
+
+    daily_savings = savings_per_hour * hours_day
+    monthly_human_cost = cost_day * days_month
+    monthly_blended_cost = blended_hourly_cost * hours_day * days_month
+    monthly_savings = daily_savings * days_month
+
+    return {
+        "human_cost_per_minute": human_hourly / 60,
+        "ai_cost_per_minute": ai_cost_per_minute,
+        "ai_hourly": ai_hourly,
+        "cost_day": cost_day,
+        "ai_cost_day": ai_hourly * hours_day,
+        "worked_hours": worked_hours,
+        "human_portion": human_portion,
+        "ai_portion": ai_portion,
+        "cost_per_eff_hour": cost_per_eff_hour,
+        "blended_hourly_cost": blended_hourly_cost,
+        "savings_per_hour": savings_per_hour,
+        "savings_pct": savings_pct,
+        "daily_savings": daily_savings,
+        "monthly_human_cost": monthly_human_cost,
+        "monthly_blended_cost": monthly_blended_cost,
+        "monthly_savings": monthly_savings,
+        "yearly_human_cost": monthly_human_cost * months_year,
+        "yearly_blended_cost": monthly_blended_cost * months_year,
+        "yearly_savings": monthly_savings * months_year,
+    }
+
+
+# —— Sensitivity Grid ——
+# Same 0-100% / 5% steps as the utilization and automation sliders, as fractions
+slider_levels = np.arange(0, 101, 5) / 100
+
+
+def sensitivity_grid(human_hourly, hours_day, tier=default_tier, levels=slider_levels):
+    # One batch pass over every (utilization, automation) pair.
+    # Rows follow efficiency, columns follow automation_pct.
+    levels = np.asarray(levels, dtype=float)
+    roi = calculate_roi_batch(human_hourly, hours_day, levels[:, None], levels[None, :], tier)
+    return {
+        "efficiency": levels,
+        "automation_pct": levels,
+        "savings_per_hour": roi["savings_per_hour"],
+        "savings_pct": roi["savings_pct"],
+    }
@@ -0,0 +1,318 @@
+"""Shareable scenario state and a local, content-addressed result store.
+
+Scenarios travel in the URL as short query params (?h=19.5&d=8&u=65&a=50&n=1&t=3).
+Rendered comparison chart PNGs are kept in a SQLite file keyed by a hash of
+their inputs, so a reopened or shared scenario skips the render, even after a
+restart or in another app process on the same disk. The figures themselves are
+cheaper to recompute than to look up and stay in the in-process memo. Prewarm
+the charts for common client profiles with:
+
+    python scenario_store.py prewarm profiles.csv --workers 4
+
+profiles.csv has the portfolio columns human_hourly, hours_day, efficiency and
+automation_pct (both in %), plus optional tier ("auto" or a label) and agents.
+The store lives at CONNEXUS_RESULT_STORE (default .cache/results.sqlite in the
+app directory); set it to an empty string to turn it off. Entries older than
+CONNEXUS_RESULT_STORE_MAX_AGE_DAYS (default 30) are dropped, and past
+CONNEXUS_RESULT_STORE_MAX_ENTRIES (default 20000) the oldest go first.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from roi_engine import calculate_roi_batch, default_tier, projected_monthly_minutes, tier_for_minutes, tier_labels
+
+# Bump when figures or chart rendering change, so older entries stop matching
+STORE_VERSION = 1
+STORE_PATH = os.environ.get("CONNEXUS_RESULT_STORE",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results.sqlite"))
+STORE_MAX_ENTRIES = int(os.environ.get("CONNEXUS_RESULT_STORE_MAX_ENTRIES", 20000))
+STORE_MAX_AGE_DAYS = float(os.environ.get("CONNEXUS_RESULT_STORE_MAX_AGE_DAYS", 30))
+PRUNE_EVERY = 500  # writes between size/age checks
+
+# —— URL Scenario State ——
+# Short query-param names. Utilization and automation are whole percentages, as
+# on the sliders; the tier is its 1-based position in tier_labels or "auto".
+scenario_params = {
+    "human_hourly": "h",
+    "hours_day": "d",
+    "efficiency": "u",
+    "automation_pct": "a",
+    "agents": "n",
+    "tier": "t",
+}
+scenario_defaults = {
+    "human_hourly": 19.5,
+    "hours_day": 8.0,
+    "efficiency": 65,
+    "automation_pct": 50,
+    "agents": 1,
+    "tier": default_tier,
+}
+
+
+# Largest whole number a browser number input holds exactly (2**53 - 1)
+MAX_SAFE_INTEGER = 9007199254740991
+
+
+def encode_scenario(scenario):
+    # repr() is the shortest text that parses back to the same float, so links round-trip
+    params = {}
+    for field, param in scenario_params.items():
+        value = scenario[field]
+        if field == "tier":
+            params[param] = "auto" if value == "auto" else str(tier_labels.index(value) + 1)
+        elif field in ("human_hourly", "hours_day"):
+            params[param] = repr(float(value))
+        else:
+            params[param] = str(int(value))
+    return params
+
+
+def _finite(value):
+    # inf and nan parse as floats but are not usable inputs
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Not a finite number: {value!r}")
+    return number
+
+
+def _slider_percent(value):
+    # Snap to the sliders' 0-100 range and 5-point step
+    return min(max(int(round(_finite(value) / 5)) * 5, 0), 100)
+
+
+def _agents(value):
+    try:
+        agents = int(value)
+    except ValueError:
+        agents = int(_finite(value))
+    if agents > MAX_SAFE_INTEGER:
+        raise ValueError(f"Too many agents: {value!r}")
+    return max(agents, 1)
+
+
+def decode_scenario(params):
+    # Missing or malformed params fall back to the defaults, one field at a time
+    parsers = {
+        "human_hourly": lambda v: max(_finite(v), 0.0),
+        "hours_day": lambda v: max(_finite(v), 0.0),
+        "efficiency": _slider_percent,
+        "automation_pct": _slider_percent,
+        "agents": _agents,
+        "tier": lambda v: "auto" if v == "auto" else tier_labels[int(v) - 1] if 1 <= int(v) <= len(tier_labels)
+        else default_tier,
+    }
+    scenario = dict(scenario_defaults)
+    for field, param in scenario_params.items():
+        if param in params:
+            try:
+                scenario[field] = parsers[field](params[param])
+            except (TypeError, ValueError):
+                pass
+    return scenario
+
+
+# —— Result Store ——
+def result_key(kind, inputs):
+    canonical = json.dumps([STORE_VERSION, kind, inputs], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultStore:
+    # One SQLite connection per thread; WAL lets app processes read while prewarm writes.
+    # Bounded by max_entries and max_age_days, checked on open and every PRUNE_EVERY writes.
+    def __init__(self, path=STORE_PATH, max_entries=STORE_MAX_ENTRIES, max_age_days=STORE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "pruned": 0}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS results "
+                       "(key TEXT PRIMARY KEY, kind TEXT NOT NULL, payload BLOB NOT NULL, created REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+        self.prune()
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _count(self, stat, n=1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def get(self, kind, inputs):
+        row = self._connect().execute("SELECT payload FROM results WHERE key = ?",
+                                      (result_key(kind, inputs),)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, kind, items, replace=True):
+        # items: (inputs, payload bytes) pairs, written in one transaction.
+        # Returns how many rows were written.
+        now = time.time()
+        verb = "REPLACE" if replace else "IGNORE"
+        with self._connect() as db:
+            before = db.total_changes
+            db.executemany(f"INSERT OR {verb} INTO results VALUES (?, ?, ?, ?)",
+                           [(result_key(kind, inputs), kind, payload, now) for inputs, payload in items])
+            written = db.total_changes - before
+        with self._stats_lock:
+            self._writes += written
+            due = self._writes >= PRUNE_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.prune()
+        return written
+
+    def prune(self):
+        # Drops entries past max_age_days, then the oldest beyond max_entries; returns how many went
+        with self._connect() as db:
+            before = db.total_changes
+            if self.max_age_days:
+                db.execute("DELETE FROM results WHERE created < ?", (time.time() - self.max_age_days * 86400,))
+            if self.max_entries:
+                db.execute("DELETE FROM results WHERE key IN "
+                           "(SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            pruned = db.total_changes - before
+        self._count("pruned", pruned)
+        return pruned
+
+    def put(self, kind, inputs, payload):
+        self.put_many(kind, [(inputs, payload)])
+
+    def missing(self, kind, inputs_list):
+        db = self._connect()
+        return [inputs for inputs in inputs_list
+                if db.execute("SELECT 1 FROM results WHERE key = ?", (result_key(kind, inputs),)).fetchone() is None]
+
+    def get_or_create(self, kind, inputs, build):
+        # build() returns the payload bytes. A store that can't be read or written
+        # (read-only disk, locked file) degrades to just calling build().
+        try:
+            payload = self.get(kind, inputs)
+        except sqlite3.Error:
+            self._count("errors")
+            return build()
+        if payload is not None:
+            self._count("hits")
+            return payload
+        self._count("misses")
+        payload = build()
+        try:
+            self.put(kind, inputs, payload)
+        except sqlite3.Error:
+            self._count("errors")
+        return payload
+
+    def counts(self):
+        return dict(self._connect().execute("SELECT kind, COUNT(*) FROM results GROUP BY kind").fetchall())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _reset_store_after_fork():
+    # SQLite connections must not cross a fork; forked workers open their own
+    global _store, _store_lock
+    _store = None
+    _store_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_store_after_fork)
+
+
+def result_store():
+    # Process-wide store, opened on first use; None when disabled or unusable
+    global _store
+    if not STORE_PATH:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = ResultStore(STORE_PATH)
+            except (OSError, sqlite3.Error):
+                return None
+        return _store
+
+
+def store_stats():
+    return dict(_store.stats) if _store is not None else {"hits": 0, "misses": 0, "errors": 0, "pruned": 0}
+
+
+# —— Prewarm ——
+def prewarm(profiles, store, workers=1):
+    # Store comparison chart PNGs for every row of a profiles DataFrame
+    # (efficiency and automation_pct as fractions). Returns how many were added.
+    from charts import chart_key, render_comparison_png
+
+    tiers = profiles["tier"].tolist() if "tier" in profiles.columns else [default_tier] * len(profiles)
+    agents = profiles["agents"].tolist() if "agents" in profiles.columns else [1] * len(profiles)
+    rows = profiles[["human_hourly", "hours_day", "efficiency", "automation_pct"]].astype(float).to_numpy()
+    tiers = [tier_for_minutes(projected_monthly_minutes(row[1], row[3], n)) if tier == "auto" else tier
+             for row, tier, n in zip(rows, tiers, agents)]
+
+    roi = calculate_roi_batch(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3], tiers)
+    keys = {chart_key(*values) for values in zip(roi["cost_per_eff_hour"].tolist(),
+                                                 roi["blended_hourly_cost"].tolist(), roi["human_portion"].tolist())}
+    keys = store.missing("comparison_png", [list(key) for key in sorted(keys)])
+    if workers > 1 and len(keys) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pngs = list(pool.map(render_comparison_png, *zip(*keys), chunksize=16))
+    else:
+        pngs = [render_comparison_png(*key) for key in keys]
+    return store.put_many("comparison_png", zip(keys, pngs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the ConnexUS scenario result store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm = commands.add_parser("prewarm", help="store comparison charts for a CSV of client profiles")
+    warm.add_argument("profiles")
+    warm.add_argument("--workers", type=int, default=1, help="processes for chart rendering")
+    commands.add_parser("prune", help="drop expired entries and the oldest beyond the size limit")
+    commands.add_parser("stats", help="entries per kind")
+    args = parser.parse_args(argv)
+
+    if not STORE_PATH:
+        print("Result store is disabled (CONNEXUS_RESULT_STORE is empty)", file=sys.stderr)
+        return 1
+    store = ResultStore(STORE_PATH)
+    if args.command == "prewarm":
+        import pandas as pd
+
+        profiles = pd.read_csv(args.profiles)
+        profiles = profiles.assign(efficiency=profiles["efficiency"] / 100,
+                                   automation_pct=profiles["automation_pct"] / 100)
+        start = time.perf_counter()
+        added = prewarm(profiles, store, workers=args.workers)
+        print(f"Added {added:,} charts for {len(profiles):,} profiles in {time.perf_counter() - start:.1f}s "
+              f"to {store.path}")
+    elif args.command == "prune":
+        print(f"Pruned {store.stats['pruned']:,} entries from {store.path}")
+    for kind, count in sorted(store.counts().items()):
+        print(f"{kind}: {count:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
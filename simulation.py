@@ -0,0 +1,85 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from roi_engine import default_tier, calculate_roi_batch
+
+# —— Monte Carlo ROI ——
+# Uncertain inputs are described by small dicts, e.g.
+#   {"dist": "normal", "mean": 0.65, "sd": 0.08}
+#   {"dist": "uniform", "low": 0.07, "high": 0.15}
+#   {"dist": "triangular", "low": 0.3, "mode": 0.5, "high": 0.7}
+#   {"dist": "fixed", "value": 0.5}
+# All of them are fractions and samples are clipped to [0, 1].
+default_distributions = {
+    "efficiency": {"dist": "normal", "mean": 0.65, "sd": 0.08},
+    "absenteeism": {"dist": "uniform", "low": 0.07, "high": 0.15},
+    "automation_pct": {"dist": "normal", "mean": 0.50, "sd": 0.10},
+}
+
+SIM_CHUNK_SIZE = 250_000  # bounds peak memory of the batch math per chunk
+PERCENTILES = (5, 50, 95)
+
+
+def sample(spec, n, rng):
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        values = np.full(n, float(spec["value"]))
+    elif dist == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], n)
+    elif dist == "triangular":
+        values = rng.triangular(spec["low"], spec["mode"], spec["high"], n)
+    elif dist == "normal":
+        values = rng.normal(spec["mean"], spec["sd"], n)
+    else:
+        raise ValueError(f"Unknown distribution: {dist!r}")
+    return np.clip(values, 0, 1)
+
+
+def _simulate_chunk(human_hourly, hours_day, tier, distributions, n, seed):
+    # Yearly savings for n samples. Absenteeism removes paid hours from the
+    # worked hours, so it scales utilization down.
+    rng = np.random.default_rng(seed)
+    yearly_savings = np.empty(n)
+    for start in range(0, n, SIM_CHUNK_SIZE):
+        size = min(SIM_CHUNK_SIZE, n - start)
+        efficiency = sample(distributions["efficiency"], size, rng)
+        absenteeism = sample(distributions["absenteeism"], size, rng)
+        automation_pct = sample(distributions["automation_pct"], size, rng)
+        roi = calculate_roi_batch(human_hourly, hours_day, efficiency * (1 - absenteeism), automation_pct, tier)
+        yearly_savings[start:start + size] = roi["yearly_savings"]
+    return yearly_savings
+
+
+def simulate_roi(human_hourly, hours_day, tier=default_tier, distributions=None, n=1_000_000,
+                 seed=None, workers=1):
+    # Returns the yearly savings samples plus P5/P50/P95 and summary figures.
+    # workers > 1 splits the samples across a process pool with independent seeds.
+    distributions = dict(default_distributions, **(distributions or {}))
+    seeds = np.random.SeedSequence(seed).spawn(max(workers, 1))
+
+    if workers > 1:
+        sizes = [n // workers + (1 if i < n % workers else 0) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_simulate_chunk, [human_hourly] * workers, [hours_day] * workers,
+                             [tier] * workers, [distributions] * workers, sizes, seeds)
+            yearly_savings = np.concatenate(list(parts))
+    else:
+        yearly_savings = _simulate_chunk(human_hourly, hours_day, tier, distributions, n, seeds[0])
+
+    p5, p50, p95 = np.percentile(yearly_savings, PERCENTILES)
+    return {
+        "yearly_savings": yearly_savings,
+        "p5": p5,
+        "p50": p50,
+        "p95": p95,
+        "mean": yearly_savings.mean(),
+        "prob_loss": (yearly_savings < 0).mean(),
+        "n": n,
+    }
+
+
+def savings_histogram(result, bins=60):
+    # Binned counts are what the chart needs; shipping 1M raw samples to the browser is not
+    counts, edges = np.histogram(result["yearly_savings"], bins=bins)
+    return counts, edges
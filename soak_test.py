@@ -0,0 +1,299 @@
+"""Concurrency and soak test: many simulated calculator sessions at once.
+
+    python soak_test.py --sessions 8 --duration 60
+    python soak_test.py --mode server --sessions 25 --duration 600 --output soak.json
+    python soak_test.py --mode server --url ws://127.0.0.1:8501/_stcore/stream --sessions 25
+
+Every session loops over random sidebar changes (hourly rate, utilization,
+automation, AI tier) and times each rerun until --duration or --reruns runs out.
+
+--mode apptest runs each session as an AppTest in its own worker process.
+--mode server launches app.py with `streamlit run` (or targets --url) and
+drives every session over the app's websocket from one event loop, so all
+sessions share one server process the way real users do (needs the websockets
+package from requirements.txt).
+
+The JSON report has p50/p99 rerun latency, reruns per second and RSS growth
+(the launched server's, or each AppTest worker's) from the moment every session
+has loaded the app to the end of the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import APP_DIR, APP_PATH, environment, summarize
+from instrumentation import current_rss_bytes
+from roi_engine import tier_labels
+
+RSS_SAMPLE_SECONDS = 1.0
+SERVER_START_TIMEOUT = 60
+
+# Widgets each simulated user changes, by label
+hourly_label = "Human Hourly Rate ($)"
+utilization_label = "Human Agent Utilization (%)"
+automation_label = "AI Automation Level (%)"
+tier_label = "AI Cost per Minute"
+
+
+def random_inputs(rng):
+    return {
+        hourly_label: round(rng.uniform(12, 35), 1),
+        utilization_label: rng.randrange(0, 101, 5),
+        automation_label: rng.randrange(0, 101, 5),
+        tier_label: rng.choice(tier_labels),
+    }
+
+
+def rss_growth(samples, warm_at=0.0):
+    # samples: (seconds since start, rss bytes). Growth counts from warm_at, once every
+    # session has loaded the app, so imports and first-run caches aren't mistaken for
+    # a leak; the rate is a least-squares slope over the same window.
+    baseline = next((rss for _, rss in samples if rss is not None), None)
+    samples = [(t, rss) for t, rss in samples if rss is not None and t >= warm_at]
+    if len(samples) < 2:
+        return None
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_rss = sum(rss for _, rss in samples) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in samples)
+    slope = sum((t - mean_t) * (rss - mean_rss) for t, rss in samples) / var_t if var_t else 0.0
+    return {
+        "baseline_bytes": baseline,
+        "start_bytes": samples[0][1],
+        "end_bytes": samples[-1][1],
+        "peak_bytes": max(rss for _, rss in samples),
+        "growth_bytes": samples[-1][1] - samples[0][1],
+        "growth_bytes_per_minute": slope * 60,
+        "samples": n,
+    }
+
+
+def report(mode, sessions, wall_seconds, latencies, session_starts, errors, rss):
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "wall_seconds": wall_seconds,
+        "reruns": len(latencies),
+        "errors": errors,
+        "throughput_reruns_per_sec": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "rerun_latency_seconds": summarize(latencies) if latencies else None,
+        "session_start_seconds": summarize(session_starts) if session_starts else None,
+        "rss": rss,
+    }
+
+
+# —— AppTest Sessions ——
+def _apptest_session(seed, duration, max_reruns, think):
+    # One simulated user in this worker process; the first run is the session start
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    at = AppTest.from_file(APP_PATH, default_timeout=120).run()
+    session_start = time.perf_counter() - start
+
+    latencies, errors = [], len(at.exception)
+    rss = [(session_start, current_rss_bytes())]
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline and (not max_reruns or len(latencies) < max_reruns):
+        inputs = random_inputs(rng)
+        at.sidebar.number_input[0].set_value(inputs[hourly_label])
+        at.sidebar.slider[0].set_value(inputs[utilization_label])
+        at.sidebar.slider[1].set_value(inputs[automation_label])
+        at.sidebar.selectbox[0].set_value(inputs[tier_label])
+        t = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - t)
+        errors += len(at.exception)
+        if rss[-1][0] + RSS_SAMPLE_SECONDS <= time.perf_counter() - start:
+            rss.append((time.perf_counter() - start, current_rss_bytes()))
+        if think:
+            time.sleep(think)
+    rss.append((time.perf_counter() - start, current_rss_bytes()))
+    return {"latencies": latencies, "session_start": session_start, "errors": errors, "rss": rss}
+
+
+def run_apptest(sessions, duration, max_reruns, think, seed):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(_apptest_session, [seed + i for i in range(sessions)], [duration] * sessions,
+                                [max_reruns] * sessions, [think] * sessions))
+    wall = time.perf_counter() - start
+    per_session = [rss_growth(result["rss"]) for result in results]
+    return report("apptest", sessions, wall,
+                  [latency for result in results for latency in result["latencies"]],
+                  [result["session_start"] for result in results],
+                  sum(result["errors"] for result in results),
+                  {
+                      "per_session": per_session,
+                      "total_growth_bytes": sum(growth["growth_bytes"] for growth in per_session if growth),
+                  })
+
+
+# —— Live Server Sessions ——
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def launch_server(port):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode} during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {SERVER_START_TIMEOUT}s")
+
+
+async def _rerun(ws, widget_ids, inputs=None):
+    # Send one rerun and read until the script finishes. Widget ids are learned
+    # from the page as it renders; returns the number of exceptions shown.
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    for label, value in (inputs or {}).items():
+        widget = msg.rerun_script.widget_states.widgets.add()
+        widget.id = widget_ids[label]
+        if label == tier_label:
+            widget.string_value = value
+        elif label == hourly_label:
+            widget.double_value = value
+        else:
+            widget.double_array_value.data.append(value)
+    await ws.send(msg.SerializeToString())
+
+    errors = 0
+    while True:
+        forward = ForwardMsg()
+        forward.ParseFromString(await ws.recv())
+        kind = forward.WhichOneof("type")
+        if kind == "script_finished":
+            return errors
+        if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+            element = forward.delta.new_element
+            element_type = element.WhichOneof("type")
+            if element_type == "exception":
+                errors += 1
+            elif element_type in ("slider", "selectbox", "number_input"):
+                widget = getattr(element, element_type)
+                widget_ids.setdefault(widget.label, widget.id)
+
+
+async def _server_session(url, seed, deadline, max_reruns, think, results):
+    import websockets
+
+    rng = random.Random(seed)
+    widget_ids = {}
+    start = time.perf_counter()
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=60) as ws:
+        results["errors"] += await _rerun(ws, widget_ids)
+        results["session_start"].append(time.perf_counter() - start)
+        results["warm_at"] = max(results["warm_at"], time.perf_counter() - results["started"])
+        reruns = 0
+        while time.monotonic() < deadline and (not max_reruns or reruns < max_reruns):
+            inputs = random_inputs(rng)
+            t = time.perf_counter()
+            results["errors"] += await _rerun(ws, widget_ids, inputs)
+            results["latencies"].append(time.perf_counter() - t)
+            reruns += 1
+            if think:
+                await asyncio.sleep(think)
+
+
+async def _sample_rss(pid, start, samples, stop):
+    while not stop.is_set():
+        samples.append((time.perf_counter() - start, current_rss_bytes(pid)))
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+    samples.append((time.perf_counter() - start, current_rss_bytes(pid)))
+
+
+async def _drive_server(url, pid, sessions, duration, max_reruns, think, seed):
+    results = {"latencies": [], "session_start": [], "errors": 0, "warm_at": 0.0}
+    samples, stop = [], asyncio.Event()
+    start = results["started"] = time.perf_counter()
+    sampler = asyncio.create_task(_sample_rss(pid, start, samples, stop)) if pid else None
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(_server_session(url, seed + i, deadline, max_reruns, think, results)
+                           for i in range(sessions)))
+    wall = time.perf_counter() - start
+    if sampler:
+        stop.set()
+        await sampler
+    return report("server", sessions, wall, results["latencies"], results["session_start"], results["errors"],
+                  rss_growth(samples, results["warm_at"]) if pid else None)
+
+
+def run_server(sessions, duration, max_reruns, think, seed, url=None):
+    if url:
+        # Someone else's process: latency and throughput only
+        return asyncio.run(_drive_server(url, None, sessions, duration, max_reruns, think, seed))
+    port = _free_port()
+    server = launch_server(port)
+    try:
+        return asyncio.run(_drive_server(f"ws://127.0.0.1:{port}/_stcore/stream", server.pid, sessions,
+                                         duration, max_reruns, think, seed))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test the ConnexUS ROI calculator with concurrent sessions.")
+    parser.add_argument("--mode", choices=["apptest", "server"], default="apptest")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds each session keeps interacting")
+    parser.add_argument("--reruns", type=int, default=0, help="stop each session after this many reruns (0: no cap)")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds between interactions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="server mode: websocket of an already running app instead of launching one")
+    parser.add_argument("--chart-backend", choices=["plotly", "matplotlib"],
+                        help="CONNEXUS_CHART_BACKEND for the sessions under test")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+    if args.chart_backend:
+        os.environ["CONNEXUS_CHART_BACKEND"] = args.chart_backend
+
+    print(f"Running {args.sessions} {args.mode} sessions for {args.duration:g}s...", file=sys.stderr)
+    if args.mode == "apptest":
+        result = run_apptest(args.sessions, args.duration, args.reruns, args.think, args.seed)
+    else:
+        result = run_server(args.sessions, args.duration, args.reruns, args.think, args.seed, args.url)
+
+    output = json.dumps({"environment": environment(), "config": vars(args), "results": result}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from goal_seek import goal_seek
+from projection import automation_ramp, project, yearly_totals
+from roi_engine import (calculate_roi, calculate_roi_batch, default_tier, projected_monthly_minutes, roi_columns,
+                        tier_for_minutes, tier_indices_for_minutes, tier_labels, tier_margin, tier_margins,
+                        tier_min_minutes, tier_rate, tier_rates, tiers_for_minutes)
+
+# —— Scalar vs Batch Parity ——
+# Includes the worked_hours == 0 (no hours or no utilization) and
+# cost_per_eff_hour == 0 (free human labour) guards
+parity_inputs = list(itertools.product(
+    [0.0, 12.5, 19.5, 40.0],  # human_hourly
+    [0.0, 4.0, 8.0],          # hours_day
+    [0.0, 0.35, 0.65, 1.0],   # efficiency
+    [0.0, 0.5, 1.0],          # automation_pct
+    tier_labels + [0.3],      # tier
+))
+
+
+def test_batch_matches_scalar_for_every_column():
+    columns = list(zip(*parity_inputs))
+    batch = calculate_roi_batch(*(np.array(column, dtype=object if i == 4 else float)
+                                  for i, column in enumerate(columns)))
+    assert list(batch) == roi_columns
+    for row, inputs in enumerate(parity_inputs):
+        scalar = calculate_roi(*inputs)
+        assert list(scalar) == roi_columns
+        for column in roi_columns:
+            assert batch[column][row] == pytest.approx(scalar[column], rel=1e-12, abs=1e-12), (inputs, column)
+
+
+def test_zero_worked_hours_fall_back_to_zero():
+    for efficiency, hours_day in [(0.0, 8.0), (0.65, 0.0)]:
+        scalar = calculate_roi(19.5, hours_day, efficiency, 0.5)
+        batch = calculate_roi_batch([19.5], [hours_day], [efficiency], [0.5])
+        assert scalar["cost_per_eff_hour"] == 0 and batch["cost_per_eff_hour"][0] == 0
+        assert scalar["savings_pct"] == 0 and batch["savings_pct"][0] == 0
+
+
+def test_default_inputs():
+    roi = calculate_roi(19.5, 8.0, 0.65, 0.5, default_tier)
+    assert roi["cost_per_eff_hour"] == pytest.approx(30.0)
+    assert roi["blended_hourly_cost"] == pytest.approx(20.4)
+    assert roi["savings_per_hour"] == pytest.approx(9.6)
+    assert roi["savings_pct"] == pytest.approx(32.0)
+
+
+# —— Tier Rates ——
+def test_tier_rates_accept_labels_and_rates():
+    assert tier_rate(default_tier) == 0.18
+    assert tier_rate(0.2) == 0.2
+    np.testing.assert_allclose(tier_rates([tier_labels[0], tier_labels[-1]]), [0.25, 0.14])
+    np.testing.assert_allclose(tier_rates([0.1, 0.2]), [0.1, 0.2])
+
+
+@pytest.mark.parametrize("tier", ["Tier 9", math.nan, math.inf, 0.0, -0.1, None])
+def test_tier_rate_rejects_unknown_and_blank_tiers(tier):
+    with pytest.raises(ValueError):
+        tier_rate(tier)
+    with pytest.raises(ValueError):
+        tier_rates(np.array([default_tier, tier], dtype=object))
+
+
+def test_tier_rates_reject_non_finite_rate_arrays():
+    with pytest.raises(ValueError):
+        tier_rates(np.array([0.18, np.nan]))
+
+
+# —— Tier Bands ——
+def test_tier_band_edges():
+    for index, minimum in enumerate(tier_min_minutes):
+        assert tier_for_minutes(minimum) == tier_labels[index]
+        below = tier_labels[max(index - 1, 0)]
+        assert tier_for_minutes(minimum - 1) == below
+    assert tier_for_minutes(0) == tier_labels[0]
+    assert tier_for_minutes(10 ** 9) == tier_labels[-1]
+
+    edges = np.array(tier_min_minutes + [m - 1 for m in tier_min_minutes] + [0, 10 ** 9], dtype=float)
+    assert list(tiers_for_minutes(edges)) == [tier_for_minutes(m) for m in edges]
+
+
+def test_missing_volume_has_no_tier():
+    with pytest.raises(ValueError):
+        tier_for_minutes(math.nan)
+    with pytest.raises(ValueError):
+        tier_indices_for_minutes([1000.0, math.nan])
+
+
+# —— Tier Margins ——
+def test_tier_margins_match_scalar():
+    tiers = np.array(tier_labels[::-1] + tier_labels, dtype=object)
+    minutes = np.arange(len(tiers)) * 1000.0
+    margins = tier_margins(tiers, minutes)
+    for i, (tier, monthly_minutes) in enumerate(zip(tiers, minutes)):
+        scalar = tier_margin(tier, monthly_minutes)
+        for column, values in margins.items():
+            assert values[i] == pytest.approx(scalar[column]), (tier, column)
+
+
+@pytest.mark.parametrize("tier", ["Tier 9", math.nan, None])
+def test_tier_margins_reject_unknown_and_blank_tiers(tier):
+    with pytest.raises(ValueError):
+        tier_margins(np.array([default_tier, tier], dtype=object))
+
+
+# —— Goal Seek Round Trip ——
+@pytest.mark.parametrize("solve_for", ["automation_pct", "efficiency", "human_hourly"])
+@pytest.mark.parametrize("metric,target", [("savings_pct", 25.0), ("yearly_savings", 15000.0)])
+def test_goal_seek_round_trip(solve_for, metric, target):
+    inputs = {"human_hourly": 19.5, "hours_day": 8.0, "efficiency": 0.65, "automation_pct": 0.5}
+    result = goal_seek(solve_for, target, metric, tier=default_tier, **inputs)
+    assert result["feasible"]
+    inputs[solve_for] = float(result["value"])
+    assert calculate_roi(**inputs, tier=default_tier)[metric] == pytest.approx(target)
+
+
+def test_goal_seek_auto_tier_round_trip():
+    targets = np.array([10.0, 25.0, 35.0])
+    result = goal_seek("automation_pct", targets, "savings_pct", 19.5, 8.0, 0.65, tier="auto", agents=10)
+    for target, value, tier in zip(targets, result["value"], result["tier"]):
+        assert tier == tier_for_minutes(projected_monthly_minutes(8.0, value, 10))
+        assert calculate_roi(19.5, 8.0, 0.65, value, tier)["savings_pct"] >= target - 1e-9
+
+
+def test_goal_seek_efficiency_caps_at_full_utilization():
+    result = goal_seek("efficiency", [10.0, 90.0], "savings_pct", 19.5, 8.0, 0.65, 0.5, default_tier)
+    assert list(result["feasible"]) == [True, False]
+    assert result["value"][0] == 1.0
+    assert calculate_roi(19.5, 8.0, 1.0, 0.5, default_tier)["savings_pct"] >= 10.0
+
+
+# —— Projection Reconciles ——
+@pytest.mark.parametrize("tier", ["auto", default_tier])
+def test_projection_costs_reconcile_with_savings(tier):
+    automation = automation_ramp([0.5, 0.8], 24, ramp_months=6, start=0.1)
+    result = project([19.5, 30.0], 8.0, [0.65, 0.9], automation, tier, agents=[10, 200], years=2)
+    np.testing.assert_allclose(result["human_cost"] - result["blended_cost"], result["savings"], atol=1e-6)
+    totals = yearly_totals(result)
+    np.testing.assert_allclose(totals["human_cost"] - totals["blended_cost"], totals["savings"], atol=1e-6)
@@ -0,0 +1,33 @@
+import pytest
+
+from roi_engine import tier_labels
+from scenario_store import ResultStore, decode_scenario, encode_scenario, scenario_defaults
+
+
+def test_scenario_round_trip():
+    scenario = dict(scenario_defaults, human_hourly=1234.567, hours_day=7.25, agents=1234567, tier=tier_labels[-1])
+    assert decode_scenario(encode_scenario(scenario)) == scenario
+    auto = dict(scenario_defaults, tier="auto")
+    assert decode_scenario(encode_scenario(auto)) == auto
+
+
+@pytest.mark.parametrize("params", [{"h": "nan"}, {"d": "inf"}, {"u": "-inf"}, {"n": "inf"}, {"n": "1e30"},
+                                    {"t": "9"}, {"h": "abc"}])
+def test_bad_params_fall_back_to_defaults(params):
+    assert decode_scenario(params) == scenario_defaults
+
+
+def test_store_prunes_oldest_beyond_max_entries(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"), max_entries=3, max_age_days=30)
+    for i in range(5):
+        store.put("comparison_png", [i], b"png")
+    assert store.prune() == 2
+    assert store.counts() == {"comparison_png": 3}
+
+
+def test_store_prunes_expired_entries(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    ResultStore(path, max_entries=0, max_age_days=0).put("comparison_png", [1], b"png")
+    store = ResultStore(path, max_entries=0, max_age_days=1e-9)
+    assert store.counts() == {}
+    assert store.stats["pruned"] == 1
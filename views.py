@@ -0,0 +1,326 @@
+import pandas as pd
+
+from incremental import memoized
+from projection import automation_ramp, project, projection_frame, working_days, yearly_totals
+from roi_engine import calculate_roi, months_year, sensitivity_grid
+
+# —— Static Page Fragments ——
+# Built once per process at import; reruns only re-send the finished strings.
+page_css = """
+<style>
+    /* Main container styling */
+    .block-container {
+        padding-top: 1rem !important;
+    }
+    
+    /* Logo styling */
+    .sidebar-logo {
+        display: flex;
+        justify-content: center;
+        margin-bottom: 20px;
+    }
+    .sidebar-logo img {
+        max-height: 60px;
+        width: auto;
+        object-fit: contain;
+    }
+    
+    /* Watermark */
+    .watermark {
+        position: fixed;
+        top: 50%;
+        left: 50%;
+        transform: translate(-50%, -50%);
+        width: 800px;
+        height: 800px;
+        opacity: 0.08;
+        background-repeat: no-repeat;
+        background-position: center;
+        background-size: contain;
+        pointer-events: none;
+        z-index: -1;
+    }
+    
+    /* Section headings */
+    .section-heading {
+        color: #00FFAA;
+        font-size: 24px;
+        font-weight: bold;
+        margin-bottom: 20px;
+        padding-left: 10px;
+        border-left: 4px solid #FF6700;
+    }
+    
+    /* Chart container styling for better fit */
+    .chart-container {
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        width: 100%;
+        max-height: 50vh;
+        margin: 20px 0;
+    }
+</style>
+"""
+
+header_html = """
+    <div style='text-align:center; font-size:40px; font-weight:bold; color:#00FFAA; margin-bottom:20px;'>
+        🤖 ConnexUS AI vs Human ROI Calculator
+    </div>
+"""
+
+
+def watermark_html(src):
+    return f"""
+        <style>
+        .watermark {{
+          background-image: url("{src}");
+        }}
+        </style>
+        <div class="watermark"></div>
+    """
+
+
+def logo_html(src):
+    return f"""
+        <div class="sidebar-logo">
+            <img src='{src}'>
+        </div>
+    """
+
+
+def section_heading(title):
+    return f"<div class='section-heading'>{title}</div>"
+
+
+# —— Memoized Derived Values ——
+# Keyed on the sidebar inputs they depend on; a rerun triggered by any other
+# widget gets the previous result back.
+roi_for = memoized(maxsize=1024)(calculate_roi)
+sensitivity_grid_for = memoized(maxsize=256)(sensitivity_grid)
+
+
+@memoized(maxsize=64)
+def projection_for(human_hourly, hours_day, efficiency, automation_pct, tier, agents, years, ramp_months,
+                   ramp_start, setup_cost, start_month):
+    # Everything the multi-year projection shows: the monthly result, yearly
+    # totals and the monthly frame indexed by calendar month for the chart
+    months = years * months_year
+    result = project(human_hourly, hours_day, efficiency,
+                     automation_ramp(automation_pct, months, ramp_months, ramp_start),
+                     tier=tier, agents=agents, years=years,
+                     calendar=working_days(start_month, months), setup_cost=setup_cost)
+    frame = projection_frame(result)
+    frame.index = pd.period_range(start_month, periods=months, freq="M").strftime("%Y-%m")
+    return result, yearly_totals(result), frame
+
+
+# —— Memoized HTML Fragments ——
+@memoized(maxsize=1024)
+def breakdown_table_html(human_hourly, hours_day, efficiency, ai_cost_per_minute, ai_hourly,
+                         cost_day, worked_hours, cost_per_eff_hour):
+    return f"""
+<div style="display: flex; justify-content: center; margin-bottom: 30px;">
+  <table style="background-color: rgba(0, 0, 0, 0.2); border-collapse: collapse; width: 80%; border: 2px solid #333; border-radius: 4px; overflow: hidden; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
+    <tr style="border-bottom: 2px solid #333; background-color: rgba(0, 0, 0, 0.3);">
+      <th style="padding: 14px; text-align: left; color: #00FFAA; border-right: 1px solid #444; font-size: 18px;"></th>
+      <th style="padding: 14px; text-align: center; color: #00FFAA; border-right: 1px solid #444; font-size: 18px;">Human</th>
+      <th style="padding: 14px; text-align: center; color: #00FFAA; font-size: 18px;">AI</th>
+    </tr>
+    <tr style="border-bottom: 1px solid #333; transition: background-color 0.2s;">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Cost per minute</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${human_hourly/60:.2f}</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_cost_per_minute:.2f}</td>
+    </tr>
+    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Hourly Rate</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${human_hourly:.2f}</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_hourly:.2f}</td>
+    </tr>
+    <tr style="border-bottom: 1px solid #333;">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Working hours per day</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{hours_day}</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">{hours_day}</td>
+    </tr>
+    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Utilization</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{efficiency*100:.0f}%</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">100%</td>
+    </tr>
+    <tr style="border-bottom: 1px solid #333;">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Cost per day</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">${cost_day:.2f}</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">${ai_hourly * hours_day:.2f}</td>
+    </tr>
+    <tr style="border-bottom: 1px solid #333; background-color: rgba(0, 0, 0, 0.1);">
+      <td style="padding: 12px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: 500;">Effective hours worked</td>
+      <td style="padding: 12px; text-align: center; color: #EEE; border-right: 1px solid #444;">{worked_hours:.2f}</td>
+      <td style="padding: 12px; text-align: center; color: #EEE;">{hours_day}</td>
+    </tr>
+    <tr style="background-color: rgba(0,0,0,0.2);">
+      <td style="padding: 14px; text-align: left; color: #EEE; border-right: 1px solid #444; font-weight: bold;">Cost per effective hour</td>
+      <td style="padding: 14px; text-align: center; color: #EEE; border-right: 1px solid #444; font-weight: bold; font-size: 18px;">${cost_per_eff_hour:.2f}</td>
+      <td style="padding: 14px; text-align: center; color: #EEE; font-weight: bold; font-size: 18px;">${ai_hourly:.2f}</td>
+    </tr>
+  </table>
+</div>
+"""
+
+
+@memoized(maxsize=1024)
+def savings_card_html(text):
+    return f"""
+        <div style="background-color: rgba(30, 70, 32, 0.8); padding: 20px; border-radius: 12px; font-size: 28px; font-weight: 700; color: #C8E6C9; margin-bottom: 20px; text-align: center;">
+        {text}
+        </div>
+    """
+
+
+@memoized(maxsize=1024)
+def projection_card_html(title, savings_text):
+    return f"""
+        <div style="background-color: rgba(42, 62, 104, 0.8); padding: 15px; border-radius: 10px; text-align: center; margin-bottom: 15px;">
+            <h4 style="color: #8BB8F8; margin: 0; font-size: 18px; font-weight: bold;">{title}</h4>
+            <p style="font-size: 22px; margin: 10px 0 5px;">
+                <span style='color:#C8E6C9;'>Savings: {savings_text}</span>
+            </p>
+        </div>
+    """
+
+
+# —— FAQ ——
+# One markdown block per tab instead of a dozen st.write calls per rerun
+faq_tabs = [
+    ("Why Choose AI", """
+### Why Businesses Are Switching to AI Voice Agents
+
+**What exactly is an AI Voice Representative?**
+
+AI Voice Representatives are cutting-edge virtual agents that revolutionize how businesses handle communications. They conduct remarkably natural phone conversations, answer complex questions, process requests, and deliver consistent excellence 24/7/365.
+
+Unlike human agents who need breaks, vacations, and sick days, our AI Voice Representatives work around the clock with zero downtime, zero turnover, and zero training requirements—transforming your customer service from a cost center into a competitive advantage.
+
+**How do AI Voice Agents differ from traditional IVR systems?**
+
+Unlike traditional IVR systems that force callers through rigid menu trees, our AI Voice Agents engage in natural conversations. They don't just recognize keywords—they understand intent, can handle complex inquiries, and provide personalized responses that sound human, creating a dramatically improved customer experience.
+"""),
+    ("Cost Savings", """
+### Cost Savings & Operational Efficiency
+
+**What kind of cost savings can I expect?**
+
+Businesses typically slash communication costs by 50-70% when implementing AI Voice Agents. Beyond the obvious savings on salaries and benefits, you'll eliminate costly overhead from:
+
+- Recruitment & Turnover Costs: No more spending thousands on hiring replacements for the average 30-45% annual call center attrition
+- Training Expenses: Eliminate the 2-6 weeks of paid training for each new agent
+- Absenteeism & No-Shows: The average call center loses 7-15% of scheduled hours to unexpected absences and no-shows
+- Management Overhead: Reduce supervisory staff needed for scheduling, quality monitoring, and performance management
+
+Use our ROI calculator above to see your specific savings potential.
+
+**How do AI Voice Agents improve operational efficiency?**
+
+Our AI Voice Agents transform your operation with:
+
+- 24/7/365 Availability: Never miss another call, even at 3 AM or during holidays
+- Infinite Scalability: Handle sudden call spikes without scrambling to staff up
+- Zero Ramp-Up Time: Deploy additional capacity instantly during seasonal peaks
+- Perfect Consistency: Every caller receives the same high-quality experience
+- Zero Burnout: Unlike humans, AI agents maintain peak performance regardless of call volume or complexity
+- Instant Knowledge Updates: New information is available across all AI agents simultaneously without training sessions
+
+**What happens to my business when calls go unanswered?**
+
+Every missed call is potentially thousands in lost revenue. Studies show:
+
+- 85% of customers whose calls go unanswered will not call back
+- 75% of callers will form a negative impression of your business from unanswered calls
+- The average missed sales call represents $1,200-$4,800 in lost potential revenue
+
+Our AI Voice Agents ensure every call is answered promptly, even during peak hours, nights, weekends, and holidays – capturing revenue that would otherwise be lost.
+"""),
+    ("Implementation", """
+### Implementation & Integration
+
+**How long does it take to implement AI Voice Agents?**
+
+Implementation timelines depend on the specific product type you choose and your business requirements. Many of our solutions can be deployed rapidly with minimal setup time.
+
+Typical implementation timelines:
+- Basic phone automation: 2-3 weeks
+- Complex integrations: 4-8 weeks
+- Enterprise-wide deployment: 8-12 weeks
+
+We work closely with your team to ensure a smooth transition with minimal disruption to your operations.
+
+**Will AI Voice Agents integrate with my existing systems?**
+
+Absolutely! Our flexible integration framework connects with virtually any business system you're currently using. Whether it's a popular CRM like Salesforce, your proprietary databases, or legacy phone systems, we design custom integration pathways that make implementation smooth and non-disruptive.
+
+Our system works with:
+- All major CRM platforms (Salesforce, Microsoft Dynamics, HubSpot, etc.)
+- Custom databases and legacy systems
+- VoIP and traditional phone systems
+- Ticketing systems (Zendesk, ServiceNow, etc.)
+- Knowledge bases and information repositories
+"""),
+    ("Capabilities", """
+### Capabilities & Customer Experience
+
+**What types of calls can AI Voice Agents handle effectively?**
+
+Our AI Voice Agents excel at handling appointment scheduling, customer service inquiries, order status updates, product information requests, lead qualification, and routine transactions. They're particularly effective for high-volume, repetitive call types that follow predictable patterns.
+
+**How do AI Voice Agents handle complex or unusual customer requests?**
+
+Our AI Voice Agents are designed to recognize when a conversation exceeds their capabilities. In these situations, they seamlessly transfer the call to a human agent, providing a complete transcript and summary of the conversation so the human agent can pick up exactly where the AI left off—creating a smooth customer experience.
+
+**Can AI Voice Agents make outbound calls too?**
+
+Absolutely! Our AI Voice Agents can conduct outbound calling campaigns for appointment reminders, payment collection, satisfaction surveys, lead qualification, and promotional offers. They can reach hundreds of customers simultaneously with personalized conversations that drive results.
+
+**How natural do the AI Voice Agents sound?**
+
+Our advanced AI technology produces remarkably natural-sounding voices that many callers cannot distinguish from humans. The agents understand context, respond to emotional cues, adjust their tone appropriately, and can even insert thoughtful pauses and conversational fillers for an authentic experience.
+
+**What languages do your AI Voice Agents support?**
+
+Our AI Voice Agents currently support over 25 languages including English, Spanish, French, German, Italian, Portuguese, Mandarin, Japanese, and Arabic. Each language version maintains natural intonation and cultural nuances for an authentic experience regardless of region.
+"""),
+    ("Getting Started", """
+### Getting Started & Pricing
+
+**How is pricing structured for AI Voice Agents?**
+
+Our pricing models are designed to provide predictability and transparency:
+
+- Monthly subscription based on usage volume
+- Per-minute rates for active AI conversation time
+- One-time implementation and integration fee
+
+Most clients see ROI within the first month of deployment. The calculator above demonstrates how the savings typically far exceed the investment.
+
+**What's the first step in getting started with AI Voice Agents?**
+
+The process begins with a consultation where we:
+
+1. Assess your current call operations
+2. Identify opportunities for AI implementation
+3. Provide a customized proposal with expected cost savings
+4. Create an implementation timeline
+5. Develop an integration plan for your existing systems
+
+We typically begin with a pilot program focused on a specific call type to demonstrate value before expanding to additional use cases.
+
+**How can I see your AI Voice Agents in action?**
+
+We offer several ways to experience our AI Voice Agents firsthand:
+
+- Live demonstration with your specific use cases
+- Sample recordings of AI conversations
+- Pilot program with limited scope to prove the concept
+- References from existing clients in your industry
+
+This gives you the opportunity to evaluate the technology with your own requirements before making a decision.
+"""),
+]